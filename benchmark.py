@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import warnings
+import zlib
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from ohlcv_store import OHLCVStore
+from sam_core import calculate_sam, calculate_sat, determine_advice, extraheer_trades, schoon_ohlcv
+from scanner import scan_universum
+
+# --- Benchmark van de SAM-pijplijn op synthetische data ---
+# ⏱️ Meet schoonmaak, calculate_sam, calculate_sat, determine_advice en de trade-extractie
+# los én van begin tot eind, zonder Yahoo: alle koersen komen uit een generator met vaste seed.
+# Resultaten worden als JSON-regels aan een bestand toegevoegd, zodat runs te vergelijken zijn.
+#
+#   python benchmark.py                                   # 1k/10k/100k/1M bars, alle soorten
+#   python benchmark.py --bars 1000 10000 --soorten crypto --universum 30 --out bench.jsonl
+
+STANDAARD_BARS = [1_000, 10_000, 100_000, 1_000_000]
+
+# 📈 Soorten reeksen: frequentie, handelsuren en beweeglijkheid per bar
+SOORTEN = {
+    "dagelijks": {"interval": "1d", "volatiliteit": 0.015, "sessie": None},
+    "intraday": {"interval": "1h", "volatiliteit": 0.004, "sessie": (9, 17)},  # beursuren, geen weekend
+    "crypto": {"interval": "1h", "volatiliteit": 0.008, "sessie": (0, 24)},  # 24/7
+}
+
+
+# 📅 Tijdas voor n bars vanaf een vaste startdatum (reproduceerbaar).
+# Seconden-resolutie: 1M bars past niet in de nanoseconden-range van pandas (tot 2262).
+def _tijdas(n, soort):
+    instelling = SOORTEN[soort]
+    begin = pd.Timestamp("2000-01-03")
+    if instelling["sessie"] is None:
+        return pd.bdate_range(start=begin, periods=n, unit="s")
+    van, tot = instelling["sessie"]
+    per_dag = tot - van
+    dagen = pd.date_range(start=begin, periods=-(-n // per_dag), freq="D" if per_dag == 24 else "B", unit="s")
+    uren = (dagen.values[:, None] + np.arange(van, tot).astype("timedelta64[h]")).ravel()
+    return pd.DatetimeIndex(uren[:n])
+
+
+# 🎲 Synthetische OHLCV met vaste seed: geometrische random walk met gaps tussen sessies
+def synthetische_ohlcv(n, soort="dagelijks", seed=0):
+    rng = np.random.default_rng(seed)
+    volatiliteit = SOORTEN[soort]["volatiliteit"]
+
+    rendement = rng.normal(0.0002, volatiliteit, n)
+    close = 100 * np.exp(np.cumsum(rendement))
+    gap = rng.normal(0, volatiliteit / 3, n)
+    open_ = np.concatenate(([100.0], close[:-1])) * np.exp(gap)
+    uitslag = np.abs(rng.normal(0, volatiliteit / 2, (2, n)))
+    high = np.maximum(open_, close) * (1 + uitslag[0])
+    low = np.minimum(open_, close) * (1 - uitslag[1])
+    volume = rng.lognormal(12, 0.6, n).round() + 1
+
+    return pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=_tijdas(n, soort),
+    )
+
+
+# 🧪 Offline bron voor de OHLCV-opslag: elke ticker een eigen seed
+def synthetische_bron(n, soort="dagelijks"):
+    def bron(tickers, interval, period=None, start=None):
+        frames = {}
+        for ticker in tickers:
+            df = synthetische_ohlcv(n, soort, seed=zlib.crc32(ticker.encode()))
+            frames[ticker] = df[df.index >= start] if start is not None else df
+        return frames
+    return bron
+
+
+def _signalen(df, threshold):
+    geldig = df.index[df["Trail"] >= threshold]
+    if len(geldig) == 0:
+        return df.iloc[0:0]
+    df_signalen = df.loc[geldig[0]:]
+    return df_signalen[df_signalen["Advies"].isin(["Kopen", "Verkopen"])]
+
+
+# 🔗 De fasen in volgorde: naam → functie(invoer) → uitvoer voor de volgende fase
+def _fasen(threshold, risk_aversion):
+    return [
+        ("schoon_ohlcv", schoon_ohlcv),
+        ("calculate_sam", calculate_sam),
+        ("calculate_sat", calculate_sat),
+        ("determine_advice", lambda df: determine_advice(df, threshold=threshold, risk_aversion=risk_aversion)[0]),
+        ("extraheer_trades", lambda df: extraheer_trades(_signalen(df, threshold))),
+    ]
+
+
+def _meet(functie, invoer, herhalingen):
+    tijden = []
+    for _ in range(herhalingen):
+        start = time.perf_counter()
+        uitvoer = functie(invoer)
+        tijden.append(time.perf_counter() - start)
+    return uitvoer, tijden
+
+
+# ⏱️ Eén reeks: elke fase los (op de uitvoer van de vorige fase) en de hele keten achter elkaar
+def meet_pijplijn(df, threshold=2, risk_aversion=False, herhalingen=3):
+    resultaten = {}
+    invoer = df
+    for naam, functie in _fasen(threshold, risk_aversion):
+        invoer, resultaten[naam] = _meet(functie, invoer, herhalingen)
+
+    def keten(df):
+        for _, functie in _fasen(threshold, risk_aversion):
+            df = functie(df)
+        return df
+
+    _, resultaten["totaal"] = _meet(keten, df, herhalingen)
+    return resultaten
+
+
+# 🌐 Universum van N tickers: som van de fasen over alle tickers + de marktscanner van begin tot eind
+# + de paneelberekening (rekentijd zonder laden)
+def meet_universum(aantal, n, soort, threshold=2, risk_aversion=False, herhalingen=1, max_workers=None):
+    tickers = [f"SYN{i:03d}" for i in range(aantal)]
+    bron = synthetische_bron(n, soort)
+    frames = bron(tickers, SOORTEN[soort]["interval"])
+
+    resultaten = {}
+    for _ in range(herhalingen):
+        per_fase = {}
+        for df in frames.values():
+            for naam, tijden in meet_pijplijn(df, threshold, risk_aversion, herhalingen=1).items():
+                per_fase[naam] = per_fase.get(naam, 0.0) + tijden[0]
+        for naam, duur in per_fase.items():
+            resultaten.setdefault(naam, []).append(duur)
+
+    for _ in range(herhalingen):
+        with tempfile.TemporaryDirectory() as map:
+            store = OHLCVStore(map=map, bron=bron)
+            _, info = scan_universum(
+                tickers, SOORTEN[soort]["interval"], threshold, risk_aversion,
+                max_workers=max_workers, store=store,
+            )
+        resultaten.setdefault("scanner_laden", []).append(info["laadtijd"])
+        resultaten.setdefault("scanner_totaal", []).append(info["totaaltijd"])
+
+    # 🧮 Zelfde universum als paneel (alle tickers in één gevectoriseerde berekening, zie paneel.py)
+    for _ in range(herhalingen):
+        with tempfile.TemporaryDirectory() as map:
+            store = OHLCVStore(map=map, bron=bron)
+            _, info = scan_universum(
+                tickers, SOORTEN[soort]["interval"], threshold, risk_aversion, store=store, paneel=True,
+            )
+        resultaten.setdefault("paneel_totaal", []).append(info["totaaltijd"] - info["laadtijd"])
+    return resultaten
+
+
+def _omgeving():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5,
+        ).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "tijdstip": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def _regel(omgeving, soort, bars, tickers, fase, tijden, risk_aversion):
+    return {
+        **omgeving,
+        "soort": soort,
+        "bars": bars,
+        "tickers": tickers,
+        "risk_aversion": risk_aversion,
+        "fase": fase,
+        "herhalingen": len(tijden),
+        "min_s": min(tijden),
+        "mediaan_s": statistics.median(tijden),
+        "bars_per_s": bars * tickers / min(tijden) if min(tijden) > 0 else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark van de SAM-pijplijn op synthetische data (offline)")
+    parser.add_argument("--bars", type=int, nargs="+", default=STANDAARD_BARS)
+    parser.add_argument("--soorten", nargs="+", choices=list(SOORTEN), default=list(SOORTEN))
+    parser.add_argument("--herhalingen", type=int, default=3)
+    parser.add_argument("--threshold", type=int, default=2)
+    parser.add_argument("--risk-aversion", action="store_true")
+    parser.add_argument("--universum", type=int, default=0, help="aantal tickers voor de universum-run (0 = overslaan)")
+    parser.add_argument("--universum-bars", type=int, default=5_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="benchmark_resultaten.jsonl")
+    args = parser.parse_args(argv)
+    warnings.simplefilter("ignore", FutureWarning)  # fillna(method=...) e.d. in de kern: niet relevant voor de metingen
+
+    omgeving = _omgeving()
+    regels = []
+    for soort in args.soorten:
+        for bars in args.bars:
+            df = synthetische_ohlcv(bars, soort, seed=bars)
+            resultaten = meet_pijplijn(df, args.threshold, args.risk_aversion, args.herhalingen)
+            for fase, tijden in resultaten.items():
+                regels.append(_regel(omgeving, soort, bars, 1, fase, tijden, args.risk_aversion))
+                print(f"{soort:<10} {bars:>9} bars  {fase:<18} {min(tijden):9.4f} s")
+
+        if args.universum:
+            resultaten = meet_universum(
+                args.universum, args.universum_bars, soort, args.threshold, args.risk_aversion,
+                herhalingen=max(1, args.herhalingen // 3), max_workers=args.workers,
+            )
+            for fase, tijden in resultaten.items():
+                regels.append(_regel(omgeving, soort, args.universum_bars, args.universum, fase, tijden, args.risk_aversion))
+                print(f"{soort:<10} {args.universum:>4} × {args.universum_bars} bars  {fase:<18} {min(tijden):9.4f} s")
+
+    with open(args.out, "a", encoding="utf-8") as f:
+        for regel in regels:
+            f.write(json.dumps(regel) + "\n")
+    print(f"📄 {len(regels)} resultaten toegevoegd aan {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import streamlit as st
 import yfinance as yf
 import pandas as pd
-from ta.trend import ADXIndicator
+from sam_core import bereken_di
 
 # Instellingen
 epsilonneg = 10.0
@@ -34,11 +34,8 @@ def bereken_samd(ticker):
     low_series = df["Low"].squeeze()
     close_series = df["Close"].squeeze()
 
-    # Bereken ADX en DI
-    adx = ADXIndicator(high=high_series, low=low_series, close=close_series, window=window)
-
-    df["DI_PLUS"] = adx.adx_pos()
-    df["DI_MINUS"] = adx.adx_neg()
+    # Bereken DI+ en DI- (zelfde uitkomst als ta's ADXIndicator zonder fillna, zie sam_core.bereken_di)
+    df["DI_PLUS"], df["DI_MINUS"] = bereken_di(high_series, low_series, close_series, window=window, fillna=False)
     df["SAMD"] = 0.0
 
     # SAMD logica
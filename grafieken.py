@@ -0,0 +1,192 @@
+import io
+
+import numpy as np
+
+# --- Grafieken: downsampling + rendering zonder Streamlit ---
+# 📉 Meer punten dan pixels tekenen kost alleen tijd. Lijnen worden met LTTB (Largest-Triangle-
+# Three-Buckets) teruggebracht tot de pixelbreedte, staafreeksen met min/max per bucket: pieken
+# en dalen blijven zichtbaar. De app cachet het resultaat per vingerafdruk + grafiekvenster.
+# Matplotlib en plotly worden pas geïmporteerd bij het tekenen.
+
+BREEDTE_PX = 1000  # figsize 10 inch × 100 dpi
+DPI = 100
+
+
+# 🔺 LTTB: indices van max. n_uit punten die de vorm van de lijn behouden (eerste en laatste altijd mee)
+def lttb_indices(y, n_uit):
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_uit >= n or n_uit < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float)
+    y_vul = np.where(np.isfinite(y), y, 0.0)  # NaN (opwarmperiode) telt als 0 bij het kiezen
+    stap = (n - 2) / (n_uit - 2)
+    gekozen = np.empty(n_uit, dtype=int)
+    gekozen[0], gekozen[-1] = 0, n - 1
+    a = 0
+    for i in range(n_uit - 2):
+        start, eind = int(i * stap) + 1, int((i + 1) * stap) + 1
+        volgende_eind = min(int((i + 2) * stap) + 1, n)
+        gem_x, gem_y = x[eind:volgende_eind].mean(), y_vul[eind:volgende_eind].mean()
+
+        # Punt in deze bucket met de grootste driehoek (vorig gekozen punt, punt, gemiddelde volgende bucket)
+        oppervlak = np.abs((x[a] - gem_x) * (y_vul[start:eind] - y_vul[a]) - (x[a] - x[start:eind]) * (gem_y - y_vul[a]))
+        a = start + int(np.argmax(oppervlak))
+        gekozen[i + 1] = a
+    return gekozen
+
+
+# 📊 Min/max per bucket: per bucket de index van het laagste en het hoogste punt (gesorteerd)
+def minmax_indices(y, n_uit):
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= n_uit:
+        return np.arange(n)
+
+    randen = np.linspace(0, n, max(n_uit // 2, 1) + 1).astype(int)
+    indices = []
+    for start, eind in zip(randen[:-1], randen[1:]):
+        blok = y[start:eind]
+        if np.isnan(blok).all():
+            indices.append(start)
+        else:
+            indices.extend((start + int(np.nanargmin(blok)), start + int(np.nanargmax(blok))))
+    return np.unique(indices)
+
+
+def _png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=DPI)
+    return buffer.getvalue()
+
+
+# Figure zonder pyplot: geen globale staat, veilig in de threads van Streamlit
+def _figuur():
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(BREEDTE_PX / DPI, 4))
+    return fig, fig.subplots()
+
+
+# 📈 Koersgrafiek: koers + MA(30)/MA(150) binnen het venster, y-as op de koers met 5% marge
+def koers_grafiek_png(df_koers, titel, breedte_px=BREEDTE_PX):
+    fig, ax = _figuur()
+    koers = df_koers["Close"].astype(float)
+    idx = lttb_indices(koers.to_numpy(), breedte_px)
+    ax.plot(df_koers.index[idx], koers.iloc[idx], color="black", linewidth=2.0, label="Koers")
+    for kolom, kleur, label in [("MA30", "orange", "MA(30)"), ("MA150", "pink", "MA(150)")]:
+        ma = df_koers[kolom].astype(float)
+        idx = lttb_indices(ma.to_numpy(), breedte_px)
+        ax.plot(df_koers.index[idx], ma.iloc[idx], color=kleur, linewidth=1.0, label=label)
+
+    ax.set_xlim(df_koers.index.min(), df_koers.index.max())
+    koers_values = koers.dropna()
+    if not koers_values.empty:
+        marge = (koers_values.max() - koers_values.min()) * 0.05
+        ax.set_ylim(koers_values.min() - marge, koers_values.max() + marge)
+
+    ax.set_title(titel)
+    ax.set_ylabel("Close")
+    ax.set_xlabel("Datum")
+    ax.legend()
+    fig.tight_layout()
+    return _png(fig)
+
+
+# 📊 SAM-staven (groen ≥ 0, rood < 0) + Trendlijn
+def sam_grafiek_png(df_grafiek, breedte_px=BREEDTE_PX):
+    fig, ax = _figuur()
+    sam = df_grafiek["SAM"].astype(float).to_numpy()
+    idx = minmax_indices(sam, breedte_px)
+    kleuren = np.where(sam[idx] >= 0, "green", "red")
+    ax.bar(df_grafiek.index[idx], sam[idx], color=kleuren, label="SAM")
+    ax.set_xlim(df_grafiek.index.min(), df_grafiek.index.max())
+    trend = df_grafiek["Trend"].astype(float)
+    idx = lttb_indices(trend.to_numpy(), breedte_px)
+    ax.plot(df_grafiek.index[idx], trend.iloc[idx], color="blue", linewidth=2, label="Trend")
+    ax.axhline(y=0, color="black", linewidth=1, linestyle="--")
+    ax.set_ylim(-4.5, 4.5)
+    ax.set_title("SAM-indicator en Trendlijn")
+    ax.set_ylabel("Waarde")
+    ax.legend()
+    fig.tight_layout()
+    return _png(fig)
+
+
+# 📊 SAT-stage (zwarte staven) + SAT-trend
+def sat_grafiek_png(df_sat, breedte_px=BREEDTE_PX):
+    fig, ax = _figuur()
+    stage = df_sat["SAT_Stage"].astype(float).to_numpy()
+    idx = minmax_indices(stage, breedte_px)
+    ax.bar(df_sat.index[idx], stage[idx], color="black", label="SAT Stage")
+    trend = df_sat["SAT_Trend"].astype(float)
+    idx = lttb_indices(trend.to_numpy(), breedte_px)
+    ax.plot(df_sat.index[idx], trend.iloc[idx], color="blue", linewidth=2, label="SAT Trend")
+    ax.axhline(y=0, color="gray", linewidth=1, linestyle="--")
+    ax.set_xlim(df_sat.index.min(), df_sat.index.max())
+    ax.set_ylim(-2.25, 2.25)
+    ax.set_ylabel("Waarde")
+    ax.set_title("SAT-indicator en Trendlijn")
+    ax.legend()
+    fig.tight_layout()
+    return _png(fig)
+
+
+# ⚡ Interactieve varianten (plotly, WebGL-lijnen): zelfde downsampling, zoomen en hoveren in de browser
+def _plotly_figuur(titel, y_bereik=None):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.update_layout(
+        title=titel, height=400, margin=dict(l=10, r=10, t=40, b=10),
+        legend=dict(orientation="h"), bargap=0, hovermode="x unified",
+    )
+    if y_bereik is not None:
+        fig.update_yaxes(range=list(y_bereik))
+    return go, fig
+
+
+def koers_grafiek_plotly(df_koers, titel, breedte_px=BREEDTE_PX):
+    go, fig = _plotly_figuur(titel)
+    for kolom, kleur, breedte, label in [
+        ("Close", "black", 2, "Koers"), ("MA30", "orange", 1, "MA(30)"), ("MA150", "pink", 1, "MA(150)"),
+    ]:
+        reeks = df_koers[kolom].astype(float)
+        idx = lttb_indices(reeks.to_numpy(), breedte_px)
+        fig.add_trace(go.Scattergl(
+            x=df_koers.index[idx], y=reeks.iloc[idx], mode="lines", name=label,
+            line=dict(color=kleur, width=breedte),
+        ))
+    return fig
+
+
+def sam_grafiek_plotly(df_grafiek, breedte_px=BREEDTE_PX):
+    go, fig = _plotly_figuur("SAM-indicator en Trendlijn", (-4.5, 4.5))
+    sam = df_grafiek["SAM"].astype(float).to_numpy()
+    idx = minmax_indices(sam, breedte_px)
+    fig.add_trace(go.Bar(
+        x=df_grafiek.index[idx], y=sam[idx], name="SAM",
+        marker_color=np.where(sam[idx] >= 0, "green", "red"),
+    ))
+    trend = df_grafiek["Trend"].astype(float)
+    idx = lttb_indices(trend.to_numpy(), breedte_px)
+    fig.add_trace(go.Scattergl(
+        x=df_grafiek.index[idx], y=trend.iloc[idx], mode="lines", name="Trend", line=dict(color="blue", width=2),
+    ))
+    fig.add_hline(y=0, line_dash="dash", line_color="black", line_width=1)
+    return fig
+
+
+def sat_grafiek_plotly(df_sat, breedte_px=BREEDTE_PX):
+    go, fig = _plotly_figuur("SAT-indicator en Trendlijn", (-2.25, 2.25))
+    stage = df_sat["SAT_Stage"].astype(float).to_numpy()
+    idx = minmax_indices(stage, breedte_px)
+    fig.add_trace(go.Bar(x=df_sat.index[idx], y=stage[idx], name="SAT Stage", marker_color="black"))
+    trend = df_sat["SAT_Trend"].astype(float)
+    idx = lttb_indices(trend.to_numpy(), breedte_px)
+    fig.add_trace(go.Scattergl(
+        x=df_sat.index[idx], y=trend.iloc[idx], mode="lines", name="SAT Trend", line=dict(color="blue", width=2),
+    ))
+    fig.add_hline(y=0, line_dash="dash", line_color="gray", line_width=1)
+    return fig
@@ -0,0 +1,169 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from sam_core import (
+    bereken_di, bereken_macd, bereken_trail, bereken_trix, schoon_ohlcv,
+    score_samd, score_samg, score_samk, score_samm, score_samt, score_samx,
+    weighted_moving_averages,
+)
+
+# --- Grid-search over de SAM-parameters ---
+# 🔬 Rekent SAM-% uit voor alle combinaties van een parametergrid, over één of meer tickers.
+# Gedeelde tussenresultaten (elke WMA-window, DI-reeks, MACD, TRIX en componentscore)
+# worden per ticker maar één keer berekend; het werk wordt over processen verdeeld.
+
+STANDAARD_PARAMETERS = {
+    "samg_kort": 18, "samg_lang": 35, "samg_band": 1.0015,
+    "samt_kort": 6, "samt_lang": 80,
+    "adx_window": 14, "eps_neg": 10.0, "eps_pos": 30.0,
+    "macd_fast": 12, "macd_slow": 26, "macd_sign": 9,
+    "trix": 15,
+    "trend_wma": 12,
+    "thresh": 2,
+}
+
+# Welke parameters bij welke component horen (bepaalt wat gedeeld kan worden)
+COMPONENT_PARAMETERS = {
+    "SAMG": ["samg_kort", "samg_lang", "samg_band"],
+    "SAMT": ["samt_kort", "samt_lang"],
+    "SAMD": ["adx_window", "eps_neg", "eps_pos"],
+    "SAMM": ["macd_fast", "macd_slow", "macd_sign"],
+    "SAMX": ["trix"],
+}
+
+
+# 🧠 Tussenresultaten per ticker, lui berekend en bewaard per unieke parametercombinatie
+class Tussenresultaten:
+    def __init__(self, df, wma_windows=()):
+        self.df = df
+        self.close = df["Close"].to_numpy(dtype=float)
+        self.wma = {w: s.to_numpy() for w, s in weighted_moving_averages(df["Close"], sorted(set(wma_windows))).items()}
+        self.samk = score_samk(df["Open"], df["Close"])
+        self._cache = {}
+
+    def _bewaard(self, sleutel, bereken):
+        if sleutel not in self._cache:
+            self._cache[sleutel] = bereken()
+        return self._cache[sleutel]
+
+    def wma_reeks(self, window):
+        if window not in self.wma:
+            self.wma[window] = weighted_moving_averages(self.df["Close"], [window])[window].to_numpy()
+        return self.wma[window]
+
+    def di(self, window):
+        return self._bewaard(("DI", window), lambda: bereken_di(self.df["High"], self.df["Low"], self.df["Close"], window))
+
+    def macd(self, fast, slow, sign):
+        return self._bewaard(("MACD", fast, slow, sign), lambda: bereken_macd(self.df["Close"], fast, slow, sign))
+
+    def trix(self, period):
+        return self._bewaard(("TRIX", period), lambda: bereken_trix(self.df["Close"], period))
+
+    def component(self, naam, waarden):
+        def bereken():
+            if naam == "SAMG":
+                kort, lang, band = waarden
+                return score_samg(self.wma_reeks(kort), self.wma_reeks(lang), band=band)
+            if naam == "SAMT":
+                kort, lang = waarden
+                return score_samt(self.wma_reeks(kort), self.wma_reeks(lang))
+            if naam == "SAMD":
+                window, neg, pos = waarden
+                return score_samd(*self.di(window), epsilonneg=neg, epsilonpos=pos)
+            if naam == "SAMM":
+                return score_samm(*self.macd(*waarden))
+            return score_samx(self.trix(*waarden))
+        return self._bewaard((naam,) + tuple(waarden), bereken)
+
+
+# 📊 SAM-% van het niet-voorzichtige advies: som van de rendementen per adviesgroep (in %),
+# zoals de SAM-% kolom van determine_advice; de groep vóór het eerste advies telt niet mee.
+def sam_rendement(close, richting, trail, threshold):
+    actief = trail >= threshold
+    signaal = np.where(actief & (richting == 1), 1, np.where(actief & (richting == -1), -1, 0))
+    posities = np.where(signaal != 0, np.arange(len(signaal)), 0)
+    advies = signaal[np.maximum.accumulate(posities)]  # ffill, vóór het eerste signaal 0
+
+    wissel = np.flatnonzero(np.diff(advies) != 0) + 1
+    starts = wissel[advies[wissel] != 0]
+    if advies.size and advies[0] != 0:
+        starts = np.concatenate(([0], starts))
+    if starts.size == 0:
+        return 0.0, 0
+
+    # Groep loopt tot de Close bij de volgende wissel; de laatste groep tot de laatste Close
+    eind_idx = np.append(wissel, len(close) - 1)[np.searchsorted(wissel, starts, side="right")]
+    start, eind = close[starts], close[eind_idx]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        markt = np.where(start != 0.0, (eind - start) / start, 0.0)
+    return float(np.sum(markt * advies[starts]) * 100), len(starts)
+
+
+def _combinaties(grid):
+    grid = {k: list(np.atleast_1d(grid.get(k, STANDAARD_PARAMETERS[k]))) for k in STANDAARD_PARAMETERS}
+    componenten = {
+        naam: list(product(*(grid[p] for p in parameters)))
+        for naam, parameters in COMPONENT_PARAMETERS.items()
+    }
+    return grid, list(product(*componenten.values()))
+
+
+# 🧮 Eén ticker (of een deel van de combinaties) doorrekenen — draait in een worker-proces
+def _evalueer(ticker, df, grid, component_combinaties):
+    grid, _ = _combinaties(grid)
+    df = schoon_ohlcv(df)
+    wma_windows = grid["samg_kort"] + grid["samg_lang"] + grid["samt_kort"] + grid["samt_lang"]
+    tussen = Tussenresultaten(df, wma_windows)
+
+    rijen = []
+    for combinatie in component_combinaties:
+        sam = tussen.samk.copy()
+        for naam, waarden in zip(COMPONENT_PARAMETERS, combinatie):
+            sam += tussen.component(naam, waarden)
+
+        # Trend-WMA's voor alle windows in één doorgang over SAM
+        trends = weighted_moving_averages(pd.Series(sam), grid["trend_wma"])
+        for trend_window, trend in trends.items():
+            trend = trend.to_numpy()
+            richting = np.sign(trend - np.concatenate(([np.nan], trend[:-1])))
+            trail = bereken_trail(richting)
+            for thresh in grid["thresh"]:
+                rendement, signalen = sam_rendement(tussen.close, richting, trail, thresh)
+                rij = {"Ticker": ticker}
+                for naam, waarden in zip(COMPONENT_PARAMETERS, combinatie):
+                    rij.update(zip(COMPONENT_PARAMETERS[naam], waarden))
+                rij.update({"trend_wma": trend_window, "thresh": thresh, "SAM-%": rendement, "Signalen": signalen})
+                rijen.append(rij)
+    return rijen
+
+
+# 🔬 Grid-search over meerdere tickers; frames = {ticker: OHLCV-DataFrame}.
+# grid = {parameter: [waarden]}; niet genoemde parameters houden hun standaardwaarde.
+def grid_search(frames, grid=None, max_workers=None):
+    grid = grid or {}
+    _, combinaties = _combinaties(grid)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    # Per ticker één taak; bij weinig tickers de combinaties opdelen zodat alle cores meedoen
+    delen = max(1, max_workers // max(len(frames), 1))
+    stukken = [combinaties[i::delen] for i in range(delen) if combinaties[i::delen]]
+    taken = [(ticker, df, grid, stuk) for ticker, df in frames.items() for stuk in stukken]
+
+    start = time.perf_counter()
+    if max_workers == 1 or not taken:
+        resultaten = [_evalueer(*taak) for taak in taken]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            resultaten = list(pool.map(_evalueer, *zip(*taken)))
+
+    kolommen = ["Ticker"] + list(STANDAARD_PARAMETERS) + ["SAM-%", "Signalen"]
+    tabel = pd.DataFrame([rij for rijen in resultaten for rij in rijen], columns=kolommen)  # leeg grid → lege tabel
+    tabel = tabel.sort_values("SAM-%", ascending=False, ignore_index=True)
+    tabel.attrs["duur"] = time.perf_counter() - start
+    return tabel
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+# --- Grovere intervallen lokaal afleiden uit fijnere bars ---
+# 🧱 4h uit 1h, 1wk en 1mo uit 1d: geen aparte download per interval, wisselen van interval
+# blijft lokaal. Buckets beginnen bij de opening van de beurs (in de tijdzone van de beurs):
+# AEX/Eurostoxx 09:00, Londen 08:00, VS 09:30, crypto 24/7 vanaf 00:00 UTC. Een restje aan het eind
+# van de sessie dat korter is dan een half blok (Euronext 17:00-17:30, Londen 16:00-16:30) gaat op in
+# het vorige blok: geen stompe bars met een fractie van het volume. Weken beginnen op maandag,
+# maanden op de 1e; het label is het begin van de bucket (zoals Yahoo).
+# Bij nieuwe bars wordt alleen de laatste (nog lopende) bucket opnieuw berekend.
+
+# interval → (bron-interval, periode van de bron)
+AFGELEID = {
+    "4h": ("1h", "720d"),
+    "1wk": ("1d", "20y"),
+    "1mo": ("1d", "20y"),
+}
+
+# markt → (tijdzone, opening, sluiting)
+SESSIES = {
+    "eu": ("Europe/Amsterdam", pd.Timedelta(hours=9), pd.Timedelta(hours=17, minutes=30)),
+    "uk": ("Europe/London", pd.Timedelta(hours=8), pd.Timedelta(hours=16, minutes=30)),
+    "us": ("America/New_York", pd.Timedelta(hours=9, minutes=30), pd.Timedelta(hours=16)),
+    "crypto": ("UTC", pd.Timedelta(0), pd.Timedelta(hours=24)),
+}
+
+_SUFFIX_MARKT = {".AS": "eu", ".PA": "eu", ".DE": "eu", ".MI": "eu", ".MC": "eu", ".BR": "eu", ".L": "uk"}
+
+AGGREGATIE = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+VIER_UUR = pd.Timedelta(hours=4)
+
+
+# 🧮 Hoogste 4h-blok binnen een sessie (0-based); een rest korter dan een half blok telt niet als eigen blok
+def laatste_blok(markt):
+    _, opening, sluiting = SESSIES[markt]
+    blokken, rest = divmod(sluiting - opening, VIER_UUR)
+    return blokken - 1 if rest < VIER_UUR / 2 else blokken
+
+
+# 🏛️ Markt bij een Yahoo-symbool (suffix); zonder suffix: VS
+def markt_van(ticker):
+    if ticker.endswith("-USD"):
+        return "crypto"
+    punt = ticker.rfind(".")
+    return _SUFFIX_MARKT.get(ticker[punt:], "us") if punt > 0 else "us"
+
+
+# 🕘 Begin van de bucket per bar (zelfde tijdzone als de index)
+def bucket_begin(index, interval, markt="us"):
+    tz, opening, _ = SESSIES[markt]
+    # Rekenen in lokale kloktijd: een sessie begint elke dag om dezelfde tijd, ook rond zomertijd
+    lokaal = index.tz_convert(tz).tz_localize(None) if index.tz is not None else index
+    dag = lokaal.normalize()
+
+    if interval == "4h":
+        anker = dag + opening
+        # Voorbeurs valt in het eerste blok, het slotrestje en nabeurs in het laatste
+        stappen = np.clip((lokaal - anker) // VIER_UUR, 0, laatste_blok(markt))
+        begin = anker + stappen * VIER_UUR
+    elif interval == "1wk":
+        begin = dag - pd.to_timedelta(dag.weekday, unit="D")
+    elif interval == "1mo":
+        begin = dag - pd.to_timedelta(dag.day - 1, unit="D")
+    else:
+        raise ValueError(f"Interval '{interval}' is niet af te leiden")
+
+    if index.tz is None:
+        return begin
+    return begin.tz_localize(tz, ambiguous=True, nonexistent="shift_forward").tz_convert(index.tz)
+
+
+# 🧮 Fijne bars → grove bars (first/max/min/last/sum)
+def hersample(df, interval, markt="us"):
+    if df is None or df.empty:
+        return df
+    aggregatie = {kol: functie for kol, functie in AGGREGATIE.items() if kol in df.columns}
+    grof = df.groupby(bucket_begin(df.index, interval, markt), sort=True).agg(aggregatie)
+    grof.index.name = df.index.name
+    return grof[list(aggregatie)]
+
+
+# 🔁 Alleen vanaf de laatste (mogelijk nog lopende) bucket opnieuw; eerdere buckets blijven staan.
+# Volledig opnieuw als de fijne reeks die bucket niet meer helemaal bevat, of als de fijne reeks
+# intussen is aangepast (split/dividend: de Close vóór de laatste bucket klopt dan niet meer).
+def hersample_incrementeel(df_fijn, df_grof, interval, markt="us"):
+    if df_grof is None or df_grof.empty or df_fijn is None or df_fijn.empty:
+        return hersample(df_fijn, interval, markt)
+    vanaf = df_grof.index[-1]
+    if df_fijn.index[0] > vanaf or df_fijn.index.tz != df_grof.index.tz:
+        return hersample(df_fijn, interval, markt)
+    if len(df_grof) > 1:
+        vorige = df_grof.index[-2]
+        kandidaten = df_fijn[df_fijn.index >= vorige - pd.Timedelta(days=1)]  # ruim: voorbeurs-bars horen bij de opening
+        begin = bucket_begin(kandidaten.index, interval, markt)
+        controle = kandidaten["Close"][begin == vorige]
+        if len(controle) and not np.isclose(controle.iloc[-1], df_grof["Close"].iloc[-2]):
+            return hersample(df_fijn, interval, markt)
+    kandidaten = df_fijn[df_fijn.index >= vanaf - pd.Timedelta(days=1)]
+    staart = hersample(kandidaten[bucket_begin(kandidaten.index, interval, markt) >= vanaf], interval, markt)
+    return pd.concat([df_grof[df_grof.index < vanaf], staart])
@@ -0,0 +1,67 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+import sam_core
+import tijdmeting
+
+# --- Indicatorcache met vingerafdruk ---
+# 🧠 st.cache_data hasht bij elke aanroep het hele DataFrame om de sleutel te bepalen; bij lange
+# historie kost dat bijna evenveel als de berekening zelf. Deze cache gebruikt een goedkope
+# vingerafdruk: (ticker, interval, eerste/laatste tijdstempel, aantal rijen, laatste Close, codeversie).
+# De laatste Close vangt een nog lopende bar op die tussentijds verandert.
+# Begrensd aantal items met LRU-verwijdering, plus dezelfde TTL als voorheen.
+
+
+# 🔖 Codeversie: hash van sam_core.py, zodat een aangepaste berekening nooit oude resultaten geeft
+def _code_versie():
+    try:
+        with open(sam_core.__file__, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()[:12]
+    except OSError:
+        return "onbekend"
+
+
+CODE_VERSIE = _code_versie()
+
+
+def vingerafdruk(ticker, interval, df):
+    if df is None or df.empty:
+        return (ticker, interval, None, None, 0, None, CODE_VERSIE)
+    laatste_close = np.ravel(df["Close"].to_numpy()[-1])[0] if "Close" in df.columns else None
+    return (ticker, interval, df.index[0], df.index[-1], len(df), laatste_close, CODE_VERSIE)
+
+
+class IndicatorCache:
+    def __init__(self, max_items=64, ttl=900):
+        self.max_items = max_items
+        self.ttl = ttl
+        self.items = OrderedDict()  # (fase, vingerafdruk) → (tijdstip, frame)
+        self.lock = threading.RLock()
+
+    # 📦 Resultaat uit de cache (als kopie: de aanroeper mag het frame aanpassen) of berekenen
+    def haal_of_bereken(self, fase, ticker, interval, df, bereken):
+        sleutel = (fase, vingerafdruk(ticker, interval, df))
+        nu = time.time()
+        with self.lock:
+            bewaard = self.items.get(sleutel)
+            if bewaard is not None and nu - bewaard[0] < self.ttl:
+                self.items.move_to_end(sleutel)
+                return bewaard[1].copy()
+
+        tijdmeting.cache_miss()
+        resultaat = bereken(df)
+
+        with self.lock:
+            self.items[sleutel] = (nu, resultaat)
+            self.items.move_to_end(sleutel)
+            while len(self.items) > self.max_items:
+                self.items.popitem(last=False)  # minst recent gebruikt eruit
+        return resultaat.copy()
+
+    def leeg(self):
+        with self.lock:
+            self.items.clear()
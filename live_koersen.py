@@ -0,0 +1,106 @@
+import threading
+import time
+
+from ohlcv_store import splits_universum, yahoo_bron
+
+# --- Gedeelde live koersen (laatste koers + dagverandering) ---
+# 📡 Eén snapshot voor het hele proces: alle sessies en reruns lezen hieruit, zonder eigen download.
+# Een achtergrondthread ververst alle universums op vaste tijden (één gegroepeerde download per
+# universum). Verouderde waarden worden gewoon getoond terwijl de thread ververst
+# (stale-while-revalidate); alleen een universum waarvan nog niets bekend is wordt direct geladen.
+# Alleen universums die onlangs zijn opgevraagd (binnen `inactief` seconden) worden ververst: tabs
+# die niemand bekijkt houden de gedeelde Yahoo-download niet bezet.
+
+
+# 🎨 Kleur bij de dagverandering (zelfde als de dropdown)
+def kleur_bij(change):
+    return "#00FF00" if change > 0 else "#FF0000" if change < 0 else "#808080"
+
+
+# 🧮 Laatste koers en verandering t.o.v. de opening van de dag, per ticker
+def _bereken_quotes(data, tickers):
+    quotes = {}
+    for ticker, df in splits_universum(data, tickers).items():
+        try:
+            last = float(df["Close"].iloc[-1])
+            prev = float(df["Open"].iloc[-1])
+            quotes[ticker] = (last, (last - prev) / prev * 100)
+        except Exception:
+            continue  # geen (geldige) dagbar: ticker ontbreekt in de dropdown, zoals voorheen
+    return quotes
+
+
+class LiveKoersen:
+    def __init__(self, universums, bron=yahoo_bron, verversen=60, inactief=300):
+        self.universums = {naam: list(tickers) for naam, tickers in universums.items()}
+        self.bron = bron
+        self.verversen = verversen  # seconden tussen twee rondes
+        self.inactief = inactief  # zo lang na de laatste opvraging blijft een universum ververst
+        self.snapshot = {}  # ticker → (last, change, tijdstip); wordt als geheel vervangen
+        self.ververst = {}  # universum → tijdstip laatste poging
+        self.gevraagd = {}  # universum → tijdstip laatste opvraging (quotes)
+        self.lock = threading.Lock()
+        self._wekker = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ▶️ Achtergrondthread starten (idempotent)
+    def start(self):
+        with self.lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._loop, name="live-koersen", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wekker.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            for naam in list(self.universums):
+                if self._stop.is_set():
+                    break
+                nu = time.time()
+                if nu - self.gevraagd.get(naam, 0) >= self.inactief:
+                    continue  # niemand kijkt: niet ophalen
+                if nu - self.ververst.get(naam, 0) >= self.verversen:
+                    self.ververs(naam)
+            self._wekker.wait(self.verversen)
+            self._wekker.clear()
+
+    # 🔄 Eén universum ophalen en de snapshot vervangen; een mislukte download laat de oude waarden staan
+    def ververs(self, naam):
+        tickers = self.universums[naam]
+        self.ververst[naam] = time.time()
+        try:
+            quotes = _bereken_quotes(self.bron(tickers, "1d", period="1d"), tickers)
+        except Exception:
+            return
+        nu = time.time()
+        with self.lock:
+            snapshot = dict(self.snapshot)
+            snapshot.update({t: (last, change, nu) for t, (last, change) in quotes.items()})
+            self.snapshot = snapshot
+
+    # 📋 Regels voor de dropdown: (ticker, naam, last, change, kleur)
+    def quotes(self, naam, tickers_dict):
+        self.gevraagd[naam] = time.time()
+        snapshot = self.snapshot
+        if naam in self.universums and not any(t in snapshot for t in tickers_dict):
+            self.ververs(naam)  # nog niets bekend (koude start): deze keer wel wachten op de download
+            snapshot = self.snapshot
+        elif time.time() - self.ververst.get(naam, 0) >= self.verversen:
+            self._wekker.set()  # verouderd: toch tonen, de thread ververst
+
+        result = []
+        for ticker, tickernaam in tickers_dict.items():
+            if ticker in snapshot:
+                last, change, _ = snapshot[ticker]
+                result.append((ticker, tickernaam, last, change, kleur_bij(change)))
+        return result
+
+    def laatste(self, ticker):
+        quote = self.snapshot.get(ticker)
+        return quote[0] if quote else None
@@ -0,0 +1,263 @@
+import os
+import re
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from hersampling import AFGELEID, hersample_incrementeel, markt_van
+
+# --- Lokale OHLCV-opslag met delta-ophalen ---
+# 💾 Per ticker/interval één Parquet-bestand. Bij elke aanvraag eerst lokaal lezen en daarna
+# alleen de bars vanaf de laatst opgeslagen tijdstempel ophalen en aanvullen.
+# De bron is verwisselbaar (standaard Yahoo Finance), zodat de opslag ook offline te testen is.
+# Yahoo past na een split of dividend de hele historie aan (auto_adjust): de delta begint daarom
+# een bar eerder, en wijkt die al afgesloten bar af van de opgeslagen Close, dan wordt de ticker
+# volledig opnieuw opgehaald.
+# Een bron krijgt een lijst tickers en geeft een frame met (Ticker, Price)-kolommen terug
+# (zoals yf.download met group_by="ticker") of een dict {ticker: frame}.
+
+STORE_MAP = os.environ.get("SAM_DATA_DIR", ".sam_data")
+OHLCV_KOLOMMEN = ["Open", "High", "Low", "Close", "Volume"]
+AANPASSING_TOLERANTIE = 1e-4  # relatief verschil in Close waarboven de historie als aangepast geldt
+
+
+# 📥 Standaardbron: Yahoo Finance, één gegroepeerde download voor alle tickers (pas geïmporteerd bij gebruik)
+# yf.download verzamelt resultaten in globale staat: downloads uit verschillende threads
+# (sessies, live koersen) daarom na elkaar.
+_yahoo_lock = threading.Lock()
+
+
+def yahoo_bron(tickers, interval, period=None, start=None):
+    import yfinance as yf
+
+    with _yahoo_lock:
+        if start is not None:
+            return yf.download(tickers, interval=interval, start=start, progress=False, group_by="ticker")
+        return yf.download(tickers, interval=interval, period=period, progress=False, group_by="ticker")
+
+
+# ✂️ Gegroepeerde download opsplitsen in één frame per ticker
+def splits_universum(data, tickers):
+    if isinstance(data, dict):
+        return {t: data.get(t) for t in tickers}
+    if data is None or data.empty:
+        return {t: None for t in tickers}
+    if not isinstance(data.columns, pd.MultiIndex):
+        return {tickers[0]: data} if len(tickers) == 1 else {t: None for t in tickers}
+
+    per_ticker = {}
+    for t in tickers:
+        if t in data.columns.get_level_values(0):
+            per_ticker[t] = data[t]
+        elif t in data.columns.get_level_values(1):
+            per_ticker[t] = data.xs(t, axis=1, level=1)
+        else:
+            per_ticker[t] = None
+    return per_ticker
+
+
+# 📅 Yahoo-periode ("30d", "720d", "20y", "1mo") naar een offset
+def periode_naar_offset(period):
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", str(period))
+    if not match:
+        return None
+    aantal, eenheid = int(match.group(1)), match.group(2)
+    if eenheid == "d":
+        return pd.DateOffset(days=aantal)
+    if eenheid == "wk":
+        return pd.DateOffset(weeks=aantal)
+    if eenheid == "mo":
+        return pd.DateOffset(months=aantal)
+    return pd.DateOffset(years=aantal)
+
+
+# 🧹 Eén vast formaat: platte OHLCV-kolommen, oplopende unieke DatetimeIndex
+def normaliseer_ohlcv(df):
+    if df is None or df.empty:
+        return pd.DataFrame(columns=OHLCV_KOLOMMEN, index=pd.DatetimeIndex([]))
+    df = df.copy()
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    df = df[[kol for kol in OHLCV_KOLOMMEN if kol in df.columns]]
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index, errors="coerce")
+    df = df[~df.index.isna()].dropna(how="all")  # lege rijen: ticker handelde niet op dat moment
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+    return df
+
+
+class OHLCVStore:
+    def __init__(self, map=STORE_MAP, bron=yahoo_bron, ttl=900, afleiden=True):
+        self.map = map
+        self.bron = bron
+        self.ttl = ttl
+        self.afleiden = afleiden  # 4h/1wk/1mo uit 1h/1d berekenen i.p.v. apart downloaden (zie hersampling.py)
+        # 🧠 Geheugencache per symbool: (ticker, interval) → (tijdstip, frame), gedeeld door alle tabs
+        self.geheugen = {}
+        self.lock = threading.RLock()
+        self.bezig = {}  # (ticker, interval) → Event, gezet zodra de ophalende thread klaar is
+
+    def pad(self, ticker, interval):
+        veilige_naam = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        return os.path.join(self.map, interval, f"{veilige_naam}.parquet")
+
+    def lees(self, ticker, interval):
+        pad = self.pad(ticker, interval)
+        if not os.path.exists(pad):
+            return None
+        return pd.read_parquet(pad)
+
+    def schrijf(self, ticker, interval, df):
+        pad = self.pad(ticker, interval)
+        os.makedirs(os.path.dirname(pad), exist_ok=True)
+        tijdelijk = f"{pad}.tmp"
+        df.to_parquet(tijdelijk)
+        os.replace(tijdelijk, pad)  # nooit een half geschreven bestand laten staan
+
+    def laad(self, ticker, interval, period):
+        return self.laad_universum([ticker], interval, period)[ticker]
+
+    # 🌐 Hele universum (een tab uit tabs_mapping of de vereniging ervan) in één keer:
+    # geheugen → lokale opslag → één gegroepeerde download voor koude en één voor warme tickers.
+    # Warme tickers: delta vanaf de voorlaatste bar (de laatste wordt overschreven: kan onvolledig zijn).
+    # 🔒 De lock dekt alleen de boekhouding (geheugen, wie haalt wat op); lezen, downloaden en
+    # schrijven gebeuren erbuiten. Wordt een (ticker, interval) al door een andere thread opgehaald
+    # (bijv. vooruit laden), dan wacht deze aanroep alleen op die sleutel.
+    def laad_universum(self, tickers, interval, period):
+        if self.afleiden and interval in AFGELEID:
+            return self._laad_afgeleid(tickers, interval, period)
+        offset = periode_naar_offset(period)
+        tickers = list(dict.fromkeys(tickers))
+
+        resultaat, eigen, anderen = {}, [], {}
+        with self.lock:
+            nu = time.time()
+            for t in tickers:
+                bewaard = self.geheugen.get((t, interval))
+                if bewaard is not None and nu - bewaard[0] < self.ttl:
+                    resultaat[t] = bewaard[1]
+                elif (t, interval) in self.bezig:
+                    anderen[t] = self.bezig[(t, interval)]
+                else:
+                    self.bezig[(t, interval)] = threading.Event()
+                    eigen.append(t)
+
+        try:
+            resultaat.update(self._haal_op(eigen, interval, period, offset))
+        finally:
+            with self.lock:
+                for t in eigen:
+                    self.bezig.pop((t, interval)).set()
+
+        for t, klaar in anderen.items():
+            klaar.wait()
+            bewaard = self.geheugen.get((t, interval))
+            resultaat[t] = bewaard[1] if bewaard is not None else normaliseer_ohlcv(self.lees(t, interval))
+
+        return {t: self._venster(resultaat[t], offset) for t in tickers}
+
+    # 📥 Lokale opslag + download voor tickers die deze thread ophaalt (buiten de lock)
+    def _haal_op(self, tickers, interval, period, offset):
+        if not tickers:
+            return {}
+        opgeslagen = {t: self.lees(t, interval) for t in tickers}
+        koud, warm = [], []
+        for t, df in opgeslagen.items():
+            if df is None or df.empty:
+                koud.append(t)
+            # Laatste bar buiten de periode → volledig opnieuw (delta zou groter zijn dan de periode)
+            elif offset is not None and df.index[-1] < pd.Timestamp.now(tz=df.index.tz) - offset:
+                koud.append(t)
+            else:
+                warm.append(t)
+
+        nieuw = {}
+        if warm:
+            # Vanaf de voorlaatste bar: die is afgesloten en dient als controle op aanpassingen
+            start = min(opgeslagen[t].index[-min(2, len(opgeslagen[t]))] for t in warm)
+            nieuw.update(self._download(warm, interval, start=start))
+            aangepast = [t for t in warm if self._aangepast(opgeslagen[t], nieuw.get(t))]
+            koud += aangepast
+            for t in aangepast:
+                nieuw.pop(t, None)
+        if koud:
+            nieuw.update(self._download(koud, interval, period=period))
+
+        resultaat = {}
+        nu = time.time()
+        for t in opgeslagen:
+            df = self._combineer(opgeslagen[t], nieuw.get(t), vervang=t in koud)
+            if df is not opgeslagen[t] and not df.empty:
+                self.schrijf(t, interval, df)
+            if not df.empty:  # mislukte download: niet 15 minuten lang "geen data", volgende keer opnieuw
+                with self.lock:
+                    self.geheugen[(t, interval)] = (nu, df)
+            resultaat[t] = df
+        return resultaat
+
+    # 🧱 Afgeleid interval: bron-interval laden (geheugen/opslag/delta zoals altijd) en lokaal hersamplen.
+    # De grove reeks blijft in het geheugen samen met de bronreeks waaruit hij komt: (tijdstip, grof, bron).
+    # Zelfde bronreeks en binnen de TTL → grove reeks uit het geheugen; anders wordt alleen de
+    # laatste bucket herberekend.
+    def _laad_afgeleid(self, tickers, interval, period):
+        bron_interval, bron_periode = AFGELEID[interval]
+        fijn = self.laad_universum(tickers, bron_interval, bron_periode)
+        offset = periode_naar_offset(period)
+
+        resultaat = {}
+        nu = time.time()
+        for t in dict.fromkeys(tickers):
+            with self.lock:
+                bewaard = self.geheugen.get((t, interval))
+                bron = self.geheugen.get((t, bron_interval))
+            bron = bron[1] if bron is not None else None
+            if bewaard is not None and bron is not None and bewaard[2] is bron and nu - bewaard[0] < self.ttl:
+                grof = bewaard[1]
+            else:
+                grof = hersample_incrementeel(fijn[t], bewaard[1] if bewaard else None, interval, markt_van(t))
+                if grof is not None and not grof.empty:
+                    with self.lock:
+                        self.geheugen[(t, interval)] = (nu, grof, bron)
+            resultaat[t] = self._venster(grof, offset)
+        return resultaat
+
+    def _download(self, tickers, interval, **kwargs):
+        try:
+            data = self.bron(tickers, interval, **kwargs)
+        except Exception:
+            return {}  # offline of bron niet bereikbaar → werk met de lokale data
+        return {t: normaliseer_ohlcv(df) for t, df in splits_universum(data, tickers).items()}
+
+    # 🔀 Afgesloten bars in de overlap met een andere Close: de bron heeft de historie aangepast
+    @staticmethod
+    def _aangepast(opgeslagen, nieuw):
+        if nieuw is None or nieuw.empty:
+            return False
+        if opgeslagen.index.tz is not None and nieuw.index.tz is not None:
+            nieuw = nieuw.tz_convert(opgeslagen.index.tz)
+        afgesloten = opgeslagen.index[:-1]  # de laatste opgeslagen bar kan onvolledig zijn geweest
+        overlap = afgesloten[afgesloten.isin(nieuw.index)]
+        if len(overlap) == 0:
+            return False
+        oud = opgeslagen.loc[overlap, "Close"].to_numpy(dtype=float)
+        nu = nieuw.loc[overlap, "Close"].to_numpy(dtype=float)
+        return not np.allclose(oud, nu, rtol=AANPASSING_TOLERANTIE, atol=0.0, equal_nan=True)
+
+    @staticmethod
+    def _combineer(opgeslagen, nieuw, vervang):
+        if nieuw is None or nieuw.empty:
+            return opgeslagen if opgeslagen is not None else normaliseer_ohlcv(None)
+        if vervang or opgeslagen is None or opgeslagen.empty:
+            return nieuw
+        if opgeslagen.index.tz is not None and nieuw.index.tz is not None:
+            nieuw = nieuw.tz_convert(opgeslagen.index.tz)
+        return pd.concat([opgeslagen[opgeslagen.index < nieuw.index[0]], nieuw])
+
+    # ✂️ Alleen de gevraagde periode teruggeven (gemeten vanaf de laatste bar)
+    @staticmethod
+    def _venster(df, offset):
+        if offset is None or df.empty:
+            return df
+        return df[df.index >= df.index[-1] - offset]
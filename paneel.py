@@ -0,0 +1,170 @@
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from sam_core import _vorige, bepaal_advies_voorzichtig, bereken_runs, bereken_sat_stage, bereken_trail, sam_kern, wma_arrays
+from tijdmeting import span
+
+# --- Paneel: SAM, Trend, SAT en Advies voor een heel universum in één keer ---
+# 🧮 Eén 2-D array per veld (bars × tickers) i.p.v. een lus over losse DataFrames. Elke ticker staat
+# in een eigen kolom vanaf rij 0 met zijn eigen bars (gepakt); kortere reeksen worden aan het eind
+# met NaN aangevuld. Alle berekeningen kijken alleen terug in de tijd, dus de aanvulling verandert
+# niets aan de echte bars: per ticker dezelfde uitkomst als calculate_sam → calculate_sat →
+# determine_advice. Pas bij het uitpakken komen de waarden op de gezamenlijke kalender
+# (vereniging van alle datums); waar een ticker geen bar heeft staat NaN.
+#
+#   paneel = Paneel(store.laad_universum(tickers, interval, bepaal_periode(interval)))
+#   uitkomst = bereken_paneel(paneel, threshold=2)        # {"SAM": DataFrame kalender × tickers, ...}
+#   overzicht(paneel, uitkomst)                           # laatste stand per ticker (zoals de scanner)
+
+PANEEL_VELDEN = ["Open", "High", "Low", "Close"]
+PANEEL_UITVOER = ["Close", "SAM", "Trend", "Trail", "SAT_Stage", "SAT_Trend", "Advies"]
+
+# ⏳ Opwarmen: aantal bars dat een ticker minstens nodig heeft voor een volledige waarde
+# (langste venster + vorige bar). SAM: WMA80; Trend: WMA12 daarover; SAT: MA150, SAT_Trend: 25 stages.
+# MACD, TRIX en DI zijn EWM's zonder vast venster en tellen hier niet mee.
+OPWARMEN = {"SAM": 80, "Trend": 91, "Trail": 92, "SAT_Stage": 151, "SAT_Trend": 175}
+
+
+class Paneel:
+    # frames: {ticker: OHLCV-frame} (zoals OHLCVStore.laad_universum); lege tickers komen in .leeg
+    def __init__(self, frames, tickers=None):
+        tickers = list(frames) if tickers is None else list(tickers)
+        bars = {t: _schone_bars(frames.get(t)) for t in tickers}
+        self.tickers = [t for t in tickers if bars[t] is not None]
+        self.leeg = [t for t in tickers if bars[t] is None]
+        indexen = [bars[t][0] for t in self.tickers]
+
+        self.kalender = reduce(lambda a, b: a.union(b), indexen) if indexen else pd.DatetimeIndex([])
+        self.lengtes = np.array([len(index) for index in indexen], dtype=np.intp)
+        self.bars = int(self.lengtes.max(initial=0))
+
+        # 📍 Plaats van elke echte bar: (bar, kolom) in het gepakte paneel ↔ rij in de kalender
+        self._kolom = np.repeat(np.arange(len(self.tickers)), self.lengtes)
+        self._bar = np.concatenate([np.arange(n) for n in self.lengtes]) if indexen else np.zeros(0, dtype=np.intp)
+        self._rij = np.concatenate([self.kalender.get_indexer(index) for index in indexen]) if indexen else self._bar
+        self.rijnummers = self.pak_rijen(self._rij, vul=-1, dtype=np.intp)  # -1 = aanvulling
+
+        # 🔁 NaN's opvullen per ticker (ffill, dan bfill) zoals schoon_ohlcv; de aanvulling aan het
+        # eind van een kolom wordt daarbij ook gevuld, maar telt nergens mee (zie uitpakken)
+        waarden = self.pak_rijen(np.concatenate([bars[t][1] for t in self.tickers]) if indexen else np.zeros((0, 4)))
+        self.velden = {veld: _vul_aan(waarden[..., i]) for i, veld in enumerate(PANEEL_VELDEN)}
+
+    # Waarden in de volgorde van de bars (ticker na ticker) → gepakt paneel (bars × tickers [× ...])
+    def pak_rijen(self, waarden, vul=np.nan, dtype=float):
+        waarden = np.asarray(waarden)
+        gepakt = np.full((self.bars, len(self.tickers)) + waarden.shape[1:], vul, dtype=dtype)
+        gepakt[self._bar, self._kolom] = waarden
+        return gepakt
+
+    # DataFrame op de kalender (zoals uit bereken_paneel) → gepakt paneel
+    def pak(self, frame):
+        waarden = frame[self.tickers].to_numpy()
+        return self.pak_rijen(waarden[self._rij, self._kolom], vul=np.nan, dtype=waarden.dtype)
+
+    # Gepakt paneel → DataFrame op de kalender (kalender × tickers), NaN waar een ticker geen bar heeft
+    def uitpakken(self, gepakt):
+        gepakt = np.asarray(gepakt)
+        soort = object if gepakt.dtype == object else float
+        uit = np.full((len(self.kalender), len(self.tickers)), np.nan, dtype=soort)
+        uit[self._rij, self._kolom] = gepakt[self._bar, self._kolom]
+        return pd.DataFrame(uit, index=self.kalender, columns=self.tickers)
+
+    # Waarde op de laatste echte bar per ticker, uit een DataFrame op de kalender
+    def laatste(self, frame):
+        kolommen = np.arange(len(self.tickers))
+        return frame[self.tickers].to_numpy()[self.rijnummers[self.lengtes - 1, kolommen], kolommen]
+
+
+# 🧹 Zelfde schoonmaak als schoon_ohlcv, maar als arrays: (index, Open/High/Low/Close) of None
+# als er niets bruikbaars is. Het opvullen van NaN's gebeurt daarna in één keer op het paneel.
+def _schone_bars(df):
+    if df is None or df.empty or "Close" not in df.columns or "Open" not in df.columns:
+        return None
+    index = df.index if isinstance(df.index, pd.DatetimeIndex) else pd.to_datetime(df.index, errors="coerce")
+    open_, high, low, close = (df[veld].to_numpy(dtype=float) for veld in PANEEL_VELDEN)
+    houden = (df["Volume"].to_numpy(dtype=float) > 0) & ((open_ != close) | (high != low)) & ~index.isna()
+    if not houden.any():
+        return None
+    return index[houden], np.column_stack([open_, high, low, close])[houden]
+
+
+# ffill en daarna bfill langs de tijd-as, per kolom
+def _vul_aan(gepakt):
+    posities = np.arange(len(gepakt)).reshape(-1, 1)
+    gevuld = np.take_along_axis(gepakt, np.maximum.accumulate(np.where(np.isnan(gepakt), 0, posities), axis=0), axis=0)
+    eerste = np.argmax(~np.isnan(gevuld), axis=0)  # eerste geldige waarde per kolom (0 als er geen is)
+    return np.where(np.isnan(gevuld), gevuld[eerste, np.arange(gepakt.shape[1])], gevuld)
+
+
+# ✅ SAM, Trend, Trail, SAT_Stage, SAT_Trend en Advies voor alle tickers van het paneel.
+# opwarmen=True: waarden vóór de opwarmperiode van de ticker (OPWARMEN) worden NaN.
+# Het huidige advies verandert daar niet door: dat komt altijd uit de laatste bar.
+def bereken_paneel(paneel, threshold=2, risk_aversion=False, opwarmen=True):
+    if not paneel.tickers:
+        return {veld: paneel.uitpakken(np.zeros((0, 0))) for veld in PANEEL_UITVOER}
+    open_, high, low, close = (paneel.velden[veld] for veld in PANEEL_VELDEN)
+    gepakt = {"Close": close}
+
+    with span("paneel_sam", tickers=len(paneel.tickers), bars=paneel.bars):
+        gepakt["SAM"] = sam_kern(open_, high, low, close)["SAM"]
+
+    # 🛡️ SAT (MA150/MA30 → stage → SAT_Trend), rolling per kolom zoals calculate_sat
+    with span("paneel_sat"):
+        koers = pd.DataFrame(close)
+        stage = bereken_sat_stage(close, koers.rolling(window=150).mean().to_numpy(), koers.rolling(window=30).mean().to_numpy())
+        gepakt["SAT_Stage"] = stage
+        gepakt["SAT_Trend"] = pd.DataFrame(stage).rolling(window=25).mean().to_numpy()
+
+    # 🧮 Trend, richting en trail zoals determine_advice
+    with span("paneel_advies", risk_aversion=risk_aversion):
+        trend = wma_arrays(gepakt["SAM"], [12])[12]
+        richting = np.sign(trend - _vorige(trend))
+        gepakt["Trend"] = trend
+        gepakt["Trail"] = bereken_trail(richting).astype(float)  # float: opwarmen zet NaN
+
+        if risk_aversion:
+            advies = bepaal_advies_voorzichtig(gepakt["SAM"], trend, gepakt["SAT_Trend"])
+        else:
+            advies = np.full(richting.shape, np.nan, dtype=object)
+            advies[(richting == 1) & (gepakt["Trail"] >= threshold)] = "Kopen"
+            advies[(richting == -1) & (gepakt["Trail"] >= threshold)] = "Verkopen"
+        gepakt["Advies"] = pd.DataFrame(advies).ffill().to_numpy()
+
+    if opwarmen:
+        for veld, bars in OPWARMEN.items():
+            gepakt[veld] = gepakt[veld].copy()
+            gepakt[veld][:bars - 1] = np.nan
+        bars_advies = OPWARMEN["SAT_Trend" if risk_aversion else "Trail"]
+        gepakt["Advies"][:bars_advies - 1] = np.nan
+
+    return {veld: paneel.uitpakken(gepakt[veld]) for veld in PANEEL_UITVOER}
+
+
+# 📋 Laatste stand per ticker, met dezelfde kolommen als de marktscanner (zonder tijd per ticker).
+# "Laatste wissel" is het begin van de lopende adviesgroep; met opwarmen=True valt dat niet vóór
+# het einde van de opwarmperiode.
+def overzicht(paneel, uitkomst, namen=None):
+    advies = paneel.pak(uitkomst["Advies"])
+    kolommen = np.arange(len(paneel.tickers))
+    laatste_advies = advies[paneel.lengtes - 1, kolommen]
+    positie, _ = bereken_runs(advies)
+    start_bar = paneel.lengtes - positie[paneel.lengtes - 1, kolommen]
+    wissel = paneel.kalender[paneel.rijnummers[start_bar, kolommen]]
+
+    laatste = {veld: paneel.laatste(uitkomst[veld]) for veld in ["SAM", "Trend", "Trail", "SAT_Trend"]}
+    if not np.isnan(laatste["Trail"]).any():
+        laatste["Trail"] = laatste["Trail"].astype(np.int64)  # geheel getal, zoals bereken_trail
+
+    rijen = pd.DataFrame({
+        "Ticker": paneel.tickers,
+        "Advies": np.where(pd.notna(laatste_advies), laatste_advies, "Niet beschikbaar"),
+        **laatste,
+        "Laatste wissel": pd.Series(wissel).where(pd.notna(laatste_advies)),
+        "Bars": paneel.lengtes,
+    })
+    lege = pd.DataFrame({"Ticker": paneel.leeg, "Advies": "Niet beschikbaar", "Bars": 0})
+    rijen = pd.concat([rijen, lege], ignore_index=True) if len(lege) else rijen
+    rijen.insert(1, "Naam", rijen["Ticker"].map(namen or {}))
+    return rijen
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+import argparse
+import os
+import sys
+import time
+import warnings
+
+from universums import UNIVERSUMS
+
+# --- SAM vanaf de commandoregel ---
+# 🖥️ Batch-advies zonder Streamlit, bv. vanuit cron:
+#   python -m sam scan --universe aex --interval 1d --out results.parquet
+#   python -m sam scan --universe aex,amx --interval 1h --threshold 3 --risk-aversion --out advies.csv
+#   python -m sam universums
+# Snel opstarten: pandas en de rekenkern worden pas geïmporteerd als een commando echt rekent.
+
+INTERVALLEN = ["15m", "1h", "4h", "1d", "1wk", "1mo"]
+
+
+def _tickers(universe, tickers):
+    gekozen = {}
+    for naam in filter(None, (universe or "").split(",")):
+        naam = naam.strip().lower()
+        if naam == "alle":
+            for lijst in UNIVERSUMS.values():
+                gekozen.update(lijst)
+        elif naam in UNIVERSUMS:
+            gekozen.update(UNIVERSUMS[naam])
+        else:
+            raise SystemExit(f"Onbekend universum '{naam}'. Kies uit: {', '.join(UNIVERSUMS)}, alle")
+    for ticker in tickers or []:
+        gekozen.setdefault(ticker, ticker)
+    if not gekozen:
+        raise SystemExit("Geef --universe en/of --tickers op")
+    return gekozen
+
+
+def _schrijf(resultaat, pad):
+    extensie = os.path.splitext(pad)[1].lower()
+    if extensie == ".parquet":
+        resultaat.to_parquet(pad, index=False)
+    elif extensie == ".csv":
+        resultaat.to_csv(pad, index=False)
+    elif extensie == ".json":
+        resultaat.to_json(pad, orient="records", date_format="iso", indent=1)
+    else:
+        raise SystemExit(f"Onbekend uitvoerformaat '{extensie}' (gebruik .parquet, .csv of .json)")
+
+
+def scan(args):
+    from ohlcv_store import OHLCVStore
+    from scanner import scan_universum
+
+    warnings.simplefilter("ignore", FutureWarning)  # fillna(method=...) e.d. in de kern: ruis in cron-mails
+
+    tickers = _tickers(args.universe, args.tickers)
+    store = OHLCVStore(map=args.data_dir) if args.data_dir else OHLCVStore()
+    resultaat, info = scan_universum(
+        tickers, args.interval, threshold=args.threshold, risk_aversion=args.risk_aversion,
+        max_workers=args.workers, store=store,
+    )
+    resultaat.insert(1, "Interval", args.interval)
+
+    if args.out:
+        _schrijf(resultaat, args.out)
+    else:
+        print(resultaat.to_string(index=False))
+    print(
+        f"✅ {len(resultaat)} tickers in {info['totaaltijd']:.2f}s met {info['workers']} workers "
+        f"(data laden {info['laadtijd']:.2f}s)" + (f" → {args.out}" if args.out else ""),
+        file=sys.stderr,
+    )
+    # Exitcode 1 als geen enkele ticker een echt advies gaf ("Fout…" of "Niet beschikbaar")
+    return 0 if resultaat["Advies"].isin(["Kopen", "Verkopen"]).any() else 1
+
+
+def universums(args):
+    for naam, lijst in UNIVERSUMS.items():
+        print(f"{naam:<10} {len(lijst):>3} tickers  {', '.join(list(lijst)[:5])}, ...")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sam", description="SAM/SAT-advies zonder Streamlit")
+    commando = parser.add_subparsers(dest="commando", required=True)
+
+    p = commando.add_parser("scan", help="advies voor een heel universum berekenen")
+    p.add_argument("--universe", help=f"komma-gescheiden: {', '.join(UNIVERSUMS)} of alle")
+    p.add_argument("--tickers", nargs="+", help="losse tickers (naast of i.p.v. --universe)")
+    p.add_argument("--interval", default="1d", choices=INTERVALLEN)
+    p.add_argument("--threshold", type=int, default=2)
+    p.add_argument("--risk-aversion", action="store_true")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--data-dir", default=None, help="map van de OHLCV-opslag (standaard SAM_DATA_DIR of .sam_data)")
+    p.add_argument("--out", help="uitvoerbestand (.parquet, .csv of .json); zonder --out naar het scherm")
+    p.set_defaults(functie=scan)
+
+    p = commando.add_parser("universums", help="beschikbare universums tonen")
+    p.set_defaults(functie=universums)
+
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    code = args.functie(args)
+    if os.environ.get("SAM_TIMING") == "1":
+        print(f"⏱️ {args.commando}: {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,764 @@
+import numpy as np
+import pandas as pd
+
+from tijdmeting import span
+
+# --- SAM-kern zonder UI ---
+# 🧮 Alle indicator- en adviesberekeningen los van Streamlit, zodat Bu.py, de scanner
+# en batch-jobs (ook in aparte processen) dezelfde code gebruiken.
+
+def weighted_moving_average(series, window):
+    return weighted_moving_averages(series, [window])[window]
+
+# ⚡ Meerdere WMA's in één doorgang over dezelfde reeks (convolutie i.p.v. rolling().apply)
+# Zelfde NaN-gedrag als rolling(window): NaN tijdens opwarmen en zodra het venster een NaN bevat.
+# Convolutie i.p.v. lopende sommen: geen opgestapelde afrondingsfouten bij lange reeksen.
+def weighted_moving_averages(series, windows):
+    if isinstance(series, pd.DataFrame):
+        series = series.squeeze(axis=1)
+
+    waarden = np.asarray(pd.to_numeric(series, errors="coerce"), dtype=float)
+    return {
+        window: pd.Series(uitkomst, index=series.index, name=series.name)
+        for window, uitkomst in wma_arrays(waarden, windows).items()
+    }
+
+# WMA's op een array: 1-D (één reeks) of 2-D (bars × tickers, per kolom)
+def wma_arrays(waarden, windows):
+    waarden = np.asarray(waarden, dtype=float)
+    kolommen = waarden.reshape(len(waarden), -1)
+    n = len(kolommen)
+    is_nan = np.isnan(kolommen)
+    schoon = np.where(is_nan, 0.0, kolommen)
+    # Cumulatief aantal NaN's, zodat per venster in O(1) te zien is of er een NaN in zit
+    nan_cum = np.concatenate((np.zeros((1, kolommen.shape[1]), dtype=int), np.cumsum(is_nan, axis=0)))
+
+    resultaat = {}
+    for window in windows:
+        uitkomst = np.full(kolommen.shape, np.nan)
+        if 0 < window <= n:
+            weights = np.arange(1, window + 1, dtype=float)
+            for j in range(kolommen.shape[1]):
+                uitkomst[window - 1:, j] = np.convolve(schoon[:, j], weights[::-1], mode="valid") / weights.sum()
+            venster_nan = nan_cum[window:] - nan_cum[:-window]
+            uitkomst[window - 1:][venster_nan > 0] = np.nan
+        resultaat[window] = uitkomst.reshape(waarden.shape)
+    return resultaat
+
+
+
+# 📅 Interval naar periode (maximale periode per interval volgens Yahoo Finance)
+def bepaal_periode(interval):
+    if interval == "15m":
+        period = "30d"     # Max voor 15m = 60d, maar 30d is veiliger/snelle laadtijd
+    elif interval == "1h":
+        period = "720d"    # Max voor 1h = ±730d (2 jaar)
+    elif interval == "4h":
+        period = "360d"    # Max voor 4h = ±730d (gedeeld over 6 candles per dag)
+    elif interval == "1d":
+        period = "20y"     # Max voor 1d = 20y
+    elif interval == "1wk":
+        period = "20y"     # Max voor 1wk = 20y
+    elif interval == "1mo":
+        period = "25y"  # maximaal bij maanddata = 25y
+    else:
+        period = "25y"     # Fallback (bijv. voor '1mo' of onbekend)
+    return period
+
+# ✅ Ophalen via de OHLCV-opslag (zie ohlcv_store.py) + schoonmaak
+def fetch_data(ticker, interval, store):
+    df = store.laad(ticker, interval, bepaal_periode(interval))
+    return schoon_ohlcv(df)
+
+# 🧹 Schoonmaak + fallback voor ruwe OHLCV-data
+def schoon_ohlcv(df):
+    # 🛡️ Check op geldige data
+    if df.empty or "Close" not in df.columns or "Open" not in df.columns:
+        return pd.DataFrame()
+
+    # 🧹 Verwijder irrelevante of foutieve rijen
+    df = df[
+        (df["Volume"] > 0) &
+        ((df["Open"] != df["Close"]) | (df["High"] != df["Low"]))
+    ]
+
+    # 🕓 Zorg dat index datetime is
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index, errors="coerce")
+    df = df[~df.index.isna()]
+
+    # 🔁 Vul NaN's op per kolom
+    for col in ["Close", "Open", "High", "Low", "Volume"]:
+        df[col] = df[col].fillna(method="ffill").fillna(method="bfill")
+
+    return df
+
+
+# --- SAM Indicatorberekeningen ---
+# 🔧 Bouwstenen met parameters: calculate_sam gebruikt de standaardwaarden,
+# de grid-search (gridsearch.py) hergebruikt dezelfde functies met andere instellingen.
+
+def _als_array(x):
+    if isinstance(x, pd.DataFrame):
+        x = x.squeeze(axis=1)
+    return np.asarray(pd.to_numeric(x, errors="coerce"), dtype=float)
+
+# Vorige waarde (shift(1)) langs de tijd-as (1-D of 2-D), eerste positie NaN
+def _vorige(x):
+    return np.concatenate((np.full((1,) + x.shape[1:], np.nan), x[:-1])) if len(x) else x
+
+# EWM op een array (1-D of 2-D bars × tickers, per kolom), zelfde uitkomst als Series.ewm
+def _ewm(x, **kwargs):
+    x = np.asarray(x, dtype=float)
+    if x.size == len(x):  # één reeks: Series.ewm is merkbaar sneller dan via een DataFrame
+        return pd.Series(x.ravel()).ewm(**kwargs).mean().to_numpy().reshape(x.shape)
+    return pd.DataFrame(x).ewm(**kwargs).mean().to_numpy()
+
+# 🧭 Wilder-smoothing zoals ta: startsom over de eerste `window` waarden (vanaf positie 1),
+# daarna s[i] = s[i-1] - s[i-1]/window + x[window+i]. Dat is een EWM met alpha = 1/window op
+# (startsom/window, x...), dus via pandas' ewm: zonder Python-lus en per kolom (bars × tickers).
+# NaN zoals ta: de startsom neemt de eerste `window` geldige waarden (dropna), en vanaf de eerste
+# NaN daarna blijft de som NaN (de EWM van pandas zou NaN overslaan).
+def _wilder_som(x, window):
+    ontbreekt = np.isnan(x)
+    if ontbreekt[1:].any():
+        geldig = ~ontbreekt
+        eerste = geldig & (np.cumsum(geldig, axis=0) <= window)
+        start = np.where(eerste, x, 0.0).sum(axis=0) / window
+    else:
+        start = x[1:window + 1].sum(axis=0) / window
+    reeks = np.concatenate((start[None, :], x[window + 1:]))
+    som = _ewm(reeks, alpha=1 / window, adjust=False) * window
+    if ontbreekt[window + 1:].any():
+        som[np.logical_or.accumulate(np.isnan(reeks), axis=0)] = np.nan
+    return som
+
+# 🧭 DI+ en DI- met dezelfde uitkomst als ta.trend.ADXIndicator(fillna=...).adx_pos()/adx_neg().
+# Invoer: Series (één ticker) of DataFrame/2-D array (bars × tickers); uitvoer in dezelfde vorm.
+def bereken_di(high, low, close, window=14, fillna=True):
+    vorm = high
+    high, low, close = (
+        np.asarray(x.apply(pd.to_numeric, errors="coerce") if isinstance(x, pd.DataFrame)
+                   else pd.to_numeric(x, errors="coerce") if isinstance(x, pd.Series) else x, dtype=float)
+        for x in (high, low, close)
+    )
+    een_d = high.ndim == 1
+    if een_d:
+        high, low, close = high[:, None], low[:, None], close[:, None]
+    n, k = high.shape
+
+    di_plus, di_min = np.zeros((n, k)), np.zeros((n, k))
+    if n > window + 1:
+        vorige_close = np.vstack((np.full((1, k), np.nan), close[:-1]))
+        tr = np.maximum(high, vorige_close) - np.minimum(low, vorige_close)
+        tr[0] = np.nan
+        omhoog = np.vstack((np.full((1, k), np.nan), high[1:] - high[:-1]))
+        omlaag = np.vstack((np.full((1, k), np.nan), low[:-1] - low[1:]))
+        # NaN-verschil blijft NaN (ta: (voorwaarde) * verschil)
+        pos = np.where((omhoog > omlaag) & (omhoog > 0), np.abs(omhoog), np.where(np.isnan(omhoog), np.nan, 0.0))
+        neg = np.where((omlaag > omhoog) & (omlaag > 0), np.abs(omlaag), np.where(np.isnan(omlaag), np.nan, 0.0))
+
+        trs, dip, din = (_wilder_som(x, window) for x in (tr, pos, neg))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            di_plus[window + 1:] = np.where(trs[1:] != 0, 100 * dip[1:] / trs[1:], 0.0)
+            di_min[window + 1:] = np.where(trs[1:] != 0, 100 * din[1:] / trs[1:], 0.0)
+
+    # fillna=True: inf/NaN → vorige waarde, daarvoor 20 (alleen nodig als er iets te vullen is)
+    di_plus, di_min = (
+        x if not fillna or np.isfinite(x).all() else pd.DataFrame(np.where(np.isfinite(x), x, np.nan)).ffill().fillna(20).to_numpy()
+        for x in (di_plus, di_min)
+    )
+
+    if isinstance(vorm, pd.Series):
+        return pd.Series(di_plus[:, 0], index=vorm.index, name="adx_pos"), pd.Series(di_min[:, 0], index=vorm.index, name="adx_neg")
+    if isinstance(vorm, pd.DataFrame):
+        return (pd.DataFrame(di_plus, index=vorm.index, columns=vorm.columns),
+                pd.DataFrame(di_min, index=vorm.index, columns=vorm.columns))
+    return (di_plus[:, 0], di_min[:, 0]) if een_d else (di_plus, di_min)
+
+# 📉 MACD en signaallijn (zelfde EMA's als ta.trend.MACD: adjust=False, min_periods = window)
+def bereken_macd(close, fast=12, slow=26, sign=9):
+    close = close.squeeze()
+    macd, signaal = macd_arrays(close.to_numpy(dtype=float), fast, slow, sign)
+    return pd.Series(macd, index=close.index), pd.Series(signaal, index=close.index)
+
+def macd_arrays(close, fast=12, slow=26, sign=9):
+    macd = (_ewm(close, span=fast, min_periods=fast, adjust=False)
+            - _ewm(close, span=slow, min_periods=slow, adjust=False))
+    return macd, _ewm(macd, span=sign, min_periods=sign, adjust=False)
+
+# 🔺 Handmatige TRIX-berekening
+def bereken_trix(series, period=15):
+    return pd.Series(trix_array(series.to_numpy(dtype=float), period), index=series.index, name=series.name)
+
+def trix_array(close, period=15):
+    ema3 = _ewm(_ewm(_ewm(close, span=period, adjust=False), span=period, adjust=False), span=period, adjust=False)
+    ema3_1 = _vorige(ema3)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (ema3 - ema3_1) / ema3_1 * 100
+
+# 🪶 Compacte opslag: alle componentscores zijn veelvouden van 0.25 → int8 in kwart-eenheden
+SAM_COMPONENTEN = ["SAMK", "SAMG", "SAMT", "SAMD", "SAMM", "SAMX"]
+KWART = 4
+
+
+def naar_kwarten(score):
+    return np.rint(np.asarray(score, dtype=float) * KWART).astype(np.int8)
+
+
+# --- Scoreregels als tabellen ---
+# 🎯 Elke component is een regeltabel: atomen (vergelijkingen op de invoer, als numpy-expressie)
+# en regels (conditie over de atomen met & en |, score). Voorrang "eerste": de eerste passende
+# regel wint (if/elif); "laatste": latere regels overschrijven eerdere (opeenvolgende df.loc's).
+# Bij het aanmaken wordt de tabel één keer gecompileerd: voor elke combinatie van atomen (2^n, bij
+# n = 8 dus 256) ligt de score vast in een opzoektabel (int8, kwart-eenheden). Evalueren = atomen
+# uitrekenen, per bar tot een code samenvoegen (bit per atoom) en één keer opzoeken.
+# In de atomen is x_1 de waarde van x één bar terug (x_2 twee bars); parameters (band, epsilons)
+# worden als getallen meegegeven. Een variant met andere scores: regelset.variant(...).
+
+class _Invoer(dict):
+    # x_1, x_2, ...: pas berekend als een atoom ernaar vraagt
+    def __missing__(self, naam):
+        basis, _, stap = naam.rpartition("_")
+        if not stap.isdigit() or int(stap) < 1 or basis not in self:
+            raise KeyError(naam)
+        waarde = _vorige(self[basis] if stap == "1" else self[f"{basis}_{int(stap) - 1}"])
+        self[naam] = waarde
+        return waarde
+
+
+class Regelset:
+    def __init__(self, atomen, regels, voorrang="eerste"):
+        if voorrang not in ("eerste", "laatste"):
+            raise ValueError(f"Onbekende voorrang '{voorrang}' (eerste of laatste)")
+        self.atomen = dict(atomen)  # naam → expressie op de invoer; volgorde = bitpositie
+        self.regels = list(regels)  # [(conditie, score), ...] in de volgorde van de oorspronkelijke code
+        self.voorrang = voorrang
+        self._code = [compile(expressie, naam, "eval") for naam, expressie in self.atomen.items()]
+        self.tabel = self._compileer()
+
+    def _compileer(self):
+        namen = list(self.atomen)
+        volgorde = self.regels if self.voorrang == "eerste" else self.regels[::-1]
+        regels = [(compile(conditie, conditie, "eval"), naar_kwarten(score)) for conditie, score in volgorde]
+        tabel = np.zeros(2 ** len(namen), dtype=np.int8)
+        for index in range(len(tabel)):
+            waarden = {naam: bool(index >> bit & 1) for bit, naam in enumerate(namen)}
+            for conditie, kwarten in regels:
+                if eval(conditie, {}, waarden):
+                    tabel[index] = kwarten
+                    break
+        return tabel
+
+    # Arrays (1-D of 2-D) + parameters → int8 in kwart-eenheden
+    def evalueer(self, **invoer):
+        waarden = _Invoer(invoer)
+        soort = np.uint8 if len(self._code) <= 8 else np.uint16 if len(self._code) <= 16 else np.intp
+        code = None
+        for bit, atoom in enumerate(self._code):
+            waar = np.asarray(eval(atoom, {}, waarden), dtype=bool).astype(soort)
+            code = waar if code is None else code | (waar << soort(bit))
+        return self.tabel[code]
+
+    # 🔧 Variant: andere scores ({conditie: score}), extra regels of andere voorrang, opnieuw gecompileerd
+    def variant(self, scores=None, extra_regels=(), voorrang=None):
+        scores = scores or {}
+        regels = [(conditie, scores.get(conditie, score)) for conditie, score in self.regels]
+        return Regelset(self.atomen, regels + list(extra_regels), voorrang or self.voorrang)
+
+
+# 🕯️ SAMK: candlestick score op basis van patronen Open/Close, eerste passende regel wint
+SAMK_REGELS = Regelset(
+    atomen={
+        "c1": "close > open", "c2": "close_1 > open_1",
+        "c3": "close > close_1", "c4": "close_1 > close_2",
+        "c5": "close < open", "c6": "close_1 < open_1",
+        "c7": "close < close_1", "c8": "close_1 < close_2",
+    },
+    regels=[
+        ("c1 & c2 & c3 & c4", 1.25), ("c1 & c3 & c4", 1.0), ("c1 & c3", 0.5), ("c1 | c3", 0.25),
+        ("c5 & c6 & c7 & c8", -1.25), ("c5 & c7 & c8", -1.0), ("c5 & c7", -0.5), ("c5 | c7", -0.25),
+    ],
+    voorrang="eerste",
+)
+
+# 📈 SAMG: kleine trendbewegingen van de korte WMA (band) + grote crossovers kort/lang.
+# Latere regels overschrijven eerdere.
+SAMG_REGELS = Regelset(
+    atomen={
+        "boven_band": "kort > kort_1 * band", "onder_band": "kort < kort_1 * band",
+        "hoger": "kort > kort_1", "niet_hoger": "kort <= kort_1",
+        "boven_band_neer": "kort > kort_1 / band", "onder_band_neer": "kort < kort_1 / band",
+        "kruist_omhoog": "(kort_1 < lang_1) & (kort > lang)",
+        "kruist_omlaag": "(kort_1 > lang_1) & (kort < lang)",
+    },
+    regels=[
+        ("boven_band & hoger", 0.5),
+        ("onder_band & hoger", -0.5),
+        ("boven_band_neer & niet_hoger", 0.5),
+        ("onder_band_neer & niet_hoger", -0.5),
+        ("kruist_omhoog", 0.75),   # oorspronkelijk 1.0, uit in nieuwere sam versie
+        ("kruist_omlaag", -0.75),  # zie vorige
+    ],
+    voorrang="laatste",
+)
+
+# 📊 SAMT: richting van de korte WMA t.o.v. de lange WMA
+SAMT_REGELS = Regelset(
+    atomen={"hoger": "kort > kort_1", "niet_hoger": "kort <= kort_1", "boven": "kort > lang", "niet_boven": "kort <= lang"},
+    regels=[
+        ("hoger & boven", 0.5),
+        ("hoger & niet_boven", 0.25),
+        ("niet_hoger & niet_boven", -0.75),
+        ("niet_hoger & boven", -0.5),
+    ],
+    voorrang="laatste",
+)
+
+# 🧭 SAMD: DI+ t.o.v. DI- met epsilon-drempels, latere regels overschrijven eerdere
+SAMD_REGELS = Regelset(
+    atomen={
+        "plus_sterk": "di_plus > epsilonpos", "plus_zwak": "di_plus <= epsilonneg",
+        "min_sterk": "di_minus > epsilonpos", "min_zwak": "di_minus <= epsilonneg",
+        "plus_aanwezig": "di_plus > epsilonneg", "min_aanwezig": "di_minus > epsilonneg",
+        "plus_boven": "di_plus > di_minus", "min_boven": "di_minus > di_plus",
+    },
+    regels=[
+        ("plus_sterk & min_zwak", 0.75),       # 1️⃣ Sterke positieve richting (was 1.0)
+        ("min_sterk & plus_zwak", -0.75),      # 2️⃣ Sterke negatieve richting (was -1.0)
+        ("plus_boven & min_aanwezig", 0.5),    # 3️⃣ Lichte positieve richting
+        ("min_boven & plus_aanwezig", -0.5),   # 4️⃣ Lichte negatieve richting
+    ],
+    voorrang="laatste",
+)
+
+# ✅ SAMM: MACD crossovers en positie t.o.v. de signaallijn, eerste passende regel wint
+SAMM_REGELS = Regelset(
+    atomen={
+        "was_onder": "macd_1 < signaal_1", "was_boven": "macd_1 > signaal_1",
+        "boven": "macd > signaal", "onder": "macd < signaal", "niet_boven": "macd <= signaal",
+    },
+    regels=[
+        ("was_onder & boven", 1.0),
+        ("boven", 0.5),
+        ("was_boven & onder", -1.0),
+        ("niet_boven", -0.5),
+    ],
+    voorrang="eerste",
+)
+
+# 🔺 SAMX: TRIX boven/onder nul en stijgend/dalend
+SAMX_REGELS = Regelset(
+    atomen={
+        "positief": "trix > 0", "negatief": "trix < 0",
+        "stijgt": "trix > trix_1", "niet_stijgend": "trix <= trix_1",
+        "daalt": "trix < trix_1", "niet_dalend": "trix >= trix_1",
+    },
+    regels=[
+        ("positief & stijgt", 0.75),         # Sterke opwaartse trend
+        ("positief & niet_stijgend", 0.5),   # Zwakke opwaartse trend
+        ("negatief & daalt", -0.75),         # Sterke neerwaartse trend
+        ("negatief & niet_dalend", -0.5),    # Zwakke neerwaartse trend
+    ],
+    voorrang="laatste",
+)
+
+# Arrays (1-D of 2-D) → int8 in kwart-eenheden (alle scores zijn veelvouden van 0.25).
+# score_* geeft dezelfde score als float, voor losse reeksen.
+def kwarten_samk(open_, close):
+    return SAMK_REGELS.evalueer(open=open_, close=close)
+
+def kwarten_samg(kort, lang, band=1.0015):
+    return SAMG_REGELS.evalueer(kort=kort, lang=lang, band=band)
+
+def kwarten_samt(kort, lang):
+    return SAMT_REGELS.evalueer(kort=kort, lang=lang)
+
+def kwarten_samd(di_plus, di_minus, epsilonneg=10.0, epsilonpos=30.0):
+    return SAMD_REGELS.evalueer(di_plus=di_plus, di_minus=di_minus, epsilonneg=epsilonneg, epsilonpos=epsilonpos)
+
+def kwarten_samm(macd, signaal):
+    return SAMM_REGELS.evalueer(macd=macd, signaal=signaal)
+
+def kwarten_samx(trix):
+    return SAMX_REGELS.evalueer(trix=trix)
+
+def score_samk(open_, close):
+    return kwarten_samk(_als_array(open_), _als_array(close)) / KWART
+
+def score_samg(kort, lang, band=1.0015):
+    return kwarten_samg(_als_array(kort), _als_array(lang), band) / KWART
+
+def score_samt(kort, lang):
+    return kwarten_samt(_als_array(kort), _als_array(lang)) / KWART
+
+def score_samd(di_plus, di_minus, epsilonneg=10.0, epsilonpos=30.0):
+    return kwarten_samd(_als_array(di_plus), _als_array(di_minus), epsilonneg, epsilonpos) / KWART
+
+def score_samm(macd, signaal):
+    return kwarten_samm(_als_array(macd), _als_array(signaal)) / KWART
+
+def score_samx(trix):
+    return kwarten_samx(_als_array(trix)) / KWART
+
+# Componentscores als float (werkt voor zowel het compacte als het debug-frame)
+def sam_componenten(df):
+    scores = df[SAM_COMPONENTEN]
+    if all(dtype == np.int8 for dtype in scores.dtypes):
+        return scores.astype(float) / KWART
+    return scores.astype(float)
+
+
+# ⚡ Gefuseerde SAM-kern: Open/High/Low/Close als arrays (1-D, of 2-D bars × tickers) → de zes
+# componenten in kwart-eenheden (int8) en SAM (float). Geen DataFrame-kolommen ertussen; regels en
+# voorrang zijn die van de kwarten_*-functies. calculate_sam (Bu.py, scanner, sam.py, benchmark)
+# gebruikt deze kern; batch-code kan hem ook direct op een heel universum aanroepen.
+# Geef een dict mee als tussenwaarden om de WMA's, DI, MACD en TRIX terug te krijgen (debug).
+def sam_kern(open_, high, low, close, tussenwaarden=None):
+    open_, high, low, close = (np.asarray(x, dtype=float) for x in (open_, high, low, close))
+    uit = {}
+
+    # --- SAMK: candlestick score op basis van patronen Open/Close ---
+    with span("SAMK"):
+        uit["SAMK"] = kwarten_samk(open_, close)
+
+    # ⚡ Alle WMA's op Close (SAMG + SAMT) in één doorgang
+    with span("WMA"):
+        wma = wma_arrays(close, [6, 18, 35, 80])
+
+    # --- SAMG (WMA-based trendanalyse met crossovers) ---
+    with span("SAMG"):
+        uit["SAMG"] = kwarten_samg(wma[18], wma[35], band=1.0015)
+
+    # --- SAMT op basis van Weighted Moving Averages 6 en 80 ---
+    with span("SAMT"):
+        uit["SAMT"] = kwarten_samt(wma[6], wma[80])
+
+    # --- SAMD op basis van DI+ en DI- ---
+    # Epsilon-drempels: 10 = vrijwel afwezig andere richting, 30 = sterke richting
+    with span("SAMD"):
+        di_plus, di_minus = bereken_di(high, low, close, window=14)
+        uit["SAMD"] = kwarten_samd(di_plus, di_minus, epsilonneg=10.0, epsilonpos=30.0)
+
+    # --- SAMM: MACD crossovers ---
+    with span("SAMM"):
+        macd, signaal = macd_arrays(close, fast=12, slow=26, sign=9)
+        uit["SAMM"] = kwarten_samm(macd, signaal)
+
+    # --- SAMX: handmatige TRIX-berekening en interpretatie ---
+    with span("SAMX"):
+        trix = trix_array(close, period=15)
+        uit["SAMX"] = kwarten_samx(trix)
+
+    # Totale SAM (som van kwarten is exact, daarna pas terug naar float)
+    totaal = uit["SAMK"].astype(np.int16)
+    for naam in SAM_COMPONENTEN[1:]:
+        totaal += uit[naam]
+    uit["SAM"] = totaal / KWART
+
+    if tussenwaarden is not None:
+        tussenwaarden.update(wma=wma, di=(di_plus, di_minus), macd=(macd, signaal), trix=trix)
+    return uit
+
+
+# ✅ SAM-berekening. Standaard compact: OHLCV + de zes componenten (int8, kwart-eenheden) + SAM.
+# debug=True geeft het volledige frame met alle tussenkolommen (c1–c8, WMA's, DI, MACD, TRIX)
+# en de componenten als float, zoals vroeger.
+def calculate_sam(df, debug=False):
+    df = df.copy()
+
+    # ————————— Flatten MultiIndex kolommen ——————————
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+
+    tussen = {} if debug else None
+    uit = sam_kern(*(_als_array(df[kolom]) for kolom in ["Open", "High", "Low", "Close"]), tussenwaarden=tussen)
+
+    if not debug:
+        for naam in SAM_COMPONENTEN:
+            df[naam] = uit[naam]
+        df["SAM"] = uit["SAM"]
+        return df
+
+    # 🔍 Debug: tussenkolommen in de vertrouwde volgorde, componenten als float
+    open_, close = _als_array(df["Open"]), _als_array(df["Close"])
+    open_1, close_1 = _vorige(open_), _vorige(close)
+    close_2 = _vorige(close_1)
+    wma = tussen["wma"]
+    kolommen = {
+        "c1": close > open_, "c2": close_1 > open_1, "c3": close > close_1, "c4": close_1 > close_2,
+        "c5": close < open_, "c6": close_1 < open_1, "c7": close < close_1, "c8": close_1 < close_2,
+        "SAMK": None,
+        "WMA18": wma[18], "WMA35": wma[35], "WMA18_shifted": _vorige(wma[18]), "WMA35_shifted": _vorige(wma[35]),
+        "SAMG": None,
+        "WMA6": wma[6], "WMA6_shifted": _vorige(wma[6]), "WMA80": wma[80],
+        "SAMT": None,
+        "DI_PLUS": tussen["di"][0], "DI_MINUS": tussen["di"][1],
+        "SAMD": None,
+        "MACD": tussen["macd"][0], "SIGNAL": tussen["macd"][1],
+        "SAMM": None,
+        "TRIX": tussen["trix"], "TRIX_PREV": _vorige(tussen["trix"]),
+        "SAMX": None,
+    }
+    for kolom, waarden in kolommen.items():
+        df[kolom] = uit[kolom] / KWART if waarden is None else waarden
+    df["SAM"] = uit["SAM"]
+
+    return df
+    
+
+ #--- Advies en rendementen ---
+# ✅ Helperfunctie voor veilige conversie naar float
+def safe_float(val):
+    try:
+        return float(val) if pd.notna(val) else 0.0
+    except:
+        return 0.0
+
+# ⚡ SAT-stage als array-berekening (zelfde zes regels + "vorige stage aanhouden")
+# Werkt op 1-D arrays (één ticker) of 2-D arrays (tijd × tickers). NaN telt als 0.0,
+# net als safe_float in de oorspronkelijke lus; rij 0 blijft NaN.
+def bereken_sat_stage(close, ma150, ma30):
+    close = np.nan_to_num(np.asarray(close, dtype=float), nan=0.0)
+    ma150 = np.nan_to_num(np.asarray(ma150, dtype=float), nan=0.0)
+    ma30 = np.nan_to_num(np.asarray(ma30, dtype=float), nan=0.0)
+
+    stage = np.full(close.shape, np.nan)
+    if len(close) < 2:
+        return stage
+
+    c, m150, m30 = close[1:], ma150[1:], ma30[1:]
+    m150_prev, m30_prev = ma150[:-1], ma30[:-1]
+
+    # Volgorde = voorrang, zoals de if/elif-keten
+    condities = [
+        ((m150 > m150_prev) & (c > m150) & (m30 > c)) |
+        ((c > m150) & (m30 < m30_prev) & (m30 > c)),
+        (m150 < m150_prev) & (c < m150) & (c > m30) & (m30 > m30_prev),
+        (m150 > c) & (m150 > m150_prev),
+        (m150 < c) & (m150 < m150_prev) & (m30 > m30_prev),
+        (m150 > c) & (m150 < m150_prev),
+        (m150 < c) & (m150 > m150_prev) & (m30 > m30_prev),
+    ]
+    keuzes = [-1.0, 1.0, -1.0, 1.0, -2.0, 2.0]
+    gekozen = np.select(condities, keuzes, default=np.nan)
+
+    # 🔁 Geen regel geraakt → vorige stage aanhouden (startwaarde 0.0): forward fill langs de tijd-as
+    gekozen = np.concatenate([np.zeros((1,) + gekozen.shape[1:]), gekozen])
+    posities = np.arange(len(gekozen)).reshape((-1,) + (1,) * (gekozen.ndim - 1))
+    laatste = np.maximum.accumulate(np.where(np.isnan(gekozen), 0, posities), axis=0)
+    stage[1:] = np.take_along_axis(gekozen, laatste, axis=0)[1:]
+    return stage
+
+# ✅ Verbeterde SAT-berekening met debug en fallback
+# Standaard compact: SAT_Stage als int8 (rij 0 zonder vorige bar wordt 0 i.p.v. NaN);
+# SAT_Trend wordt altijd uit de float-stage berekend en is dus identiek. debug=True: stage als float.
+def calculate_sat(df, debug=False):
+    # ✅ Controle op MultiIndex en 'Close'-fallback
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+
+    if "Close" not in df.columns:
+        mogelijke_close = [col for col in df.columns if col.lower() == "close" or "close" in col.lower()]
+        if mogelijke_close:
+            df["Close"] = df[mogelijke_close[0]]
+        else:
+            return df  # ❌ geen geldige 'Close'-kolom: SAT niet te berekenen (melding in de UI)
+
+    # ✅ Berekeningen
+    df["MA150"] = df["Close"].rolling(window=150).mean()
+    df["MA30"] = df["Close"].rolling(window=30).mean()
+    stage = pd.Series(bereken_sat_stage(df["Close"], df["MA150"], df["MA30"]), index=df.index, dtype=float)
+    df["SAT_Stage"] = stage if debug else np.nan_to_num(stage.to_numpy(), nan=0.0).astype(np.int8)
+    df["SAT_Trend"] = stage.rolling(window=25).mean()
+    return df
+    
+    # 📊 Debug: Laatste waarden MA150 en MA30
+ #   st.write("Laatste 5 waarden van MA150:", df["MA150"].tail())
+ # ×  st.write("Laatste 5 waarden van MA30:", df["MA30"].tail())
+# ÷   st.write("📈 Laatste Close-waarden:", df["Close"].tail(10))
+  #  return df
+    
+#st.write("MA150 laatste waarden:", df["MA150"].tail())
+#st.write("MA30 laatste waarden:", df["MA30"].tail())
+#st.write("SAT_Stage laatste waarden:", df["SAT_Stage"].tail())    
+
+
+# ⚡ Run-length encoding: positie binnen elke reeks gelijke waarden + startindex per reeks
+# NaN is nooit gelijk aan de vorige waarde (zelfde gedrag als `!=` met shift() in pandas)
+# Werkt langs de tijd-as, ook op 2-D arrays (tijd × tickers, zie paneel.py): dan zijn de starts
+# (rijen, kolommen) zoals np.nonzero.
+def bereken_runs(waarden):
+    waarden = np.asarray(waarden)
+    nieuw = np.ones(waarden.shape, dtype=bool)
+    if len(waarden) > 1:
+        geldig = pd.notna(waarden)
+        nieuw[1:] = ~((waarden[1:] == waarden[:-1]) & geldig[1:] & geldig[:-1])
+    posities = np.arange(len(waarden)).reshape((-1,) + (1,) * (waarden.ndim - 1))
+    begin = np.maximum.accumulate(np.where(nieuw, posities, 0), axis=0)
+    starts = np.flatnonzero(nieuw) if waarden.ndim == 1 else np.nonzero(nieuw)
+    return posities - begin + 1, starts
+
+# 🔁 Trail = aantal opeenvolgende perioden met dezelfde (niet-nul) richting
+# Rij 0 blijft 0 en telt niet mee, NaN-richting telt als eigen reeks van 1 (zoals de oude lus)
+def bereken_trail(richting):
+    richting = np.asarray(richting, dtype=float)
+    trail = np.zeros(richting.shape, dtype=np.int64)
+    if len(richting) < 2:
+        return trail
+    positie, _ = bereken_runs(richting[1:])
+    trail[1:] = np.where(richting[1:] != 0, positie, 0)
+    return trail
+
+
+# 🛡️ Voorzichtig advies (risk aversion) als array-berekening
+# sam_3 = laatste 3 SAM-waarden; rij 0 en 1 krijgen geen advies. Resultaat nog niet ge-ffilled.
+# Werkt op 1-D arrays (één ticker) of 2-D arrays (tijd × tickers, zie paneel.py).
+def bepaal_advies_voorzichtig(sam, trend, sat_trend):
+    pos3 = np.zeros(sam.shape, dtype=bool)
+    neg3 = np.zeros(sam.shape, dtype=bool)
+    if len(sam) > 2:
+        pos, neg = sam > 0, sam < 0
+        pos3[2:] = pos[2:] & pos[1:-1] & pos[:-2]
+        neg3[2:] = neg[2:] & neg[1:-1] & neg[:-2]
+
+    # 🔹 Positieve trend (of 3x positieve SAM), anders 🔹 negatieve trend; NaN-trend → geen advies
+    positief = (sat_trend >= 0.0) | pos3
+    negatief = ~positief & (sat_trend < 0.0)
+    positief[:2] = False
+    negatief[:2] = False
+
+    advies = np.full(sam.shape, np.nan, dtype=object)
+    advies[positief & (neg3 | (trend < 0))] = "Verkopen"
+    advies[positief & ~(neg3 | (trend < 0))] = "Kopen"
+    advies[negatief & (pos3 | (trend > 0))] = "Kopen"
+    advies[negatief & ~(pos3 | (trend > 0))] = "Verkopen"
+    return advies
+
+
+# 📊 Rendement per adviesgroep: van de Close bij de start tot de Close bij de start van de
+# volgende groep (laatste groep: laatste Close), per rij herhaald met np.repeat
+def bereken_groepsrendementen(close, advies, starts):
+    if isinstance(close, pd.DataFrame):
+        close = close.squeeze(axis=1)
+    close = np.asarray(pd.to_numeric(close, errors="coerce"), dtype=float)
+    n = len(close)
+
+    eind_idx = np.append(starts[1:], n - 1)[:len(starts)]
+    start = close[starts]
+    eind = close[eind_idx]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        markt_rendement = np.where(start != 0.0, (eind - start) / start, 0.0)
+    sam_rendement = np.where(advies[starts] == "Kopen", markt_rendement, -markt_rendement)
+    sam_rendement = np.where(start != 0.0, sam_rendement, 0.0)
+
+    lengtes = np.diff(np.append(starts, n))
+    return np.repeat(markt_rendement, lengtes), np.repeat(sam_rendement, lengtes)
+
+
+def determine_advice(df, threshold, risk_aversion=False):
+    df = df.copy()
+
+    # 🧮 Trendberekening over SAM
+    df["Trend"] = weighted_moving_average(df["SAM"], 12)
+    df["TrendChange"] = df["Trend"] - df["Trend"].shift(1)
+    df["Richting"] = np.sign(df["TrendChange"])
+
+    # 🔁 Bereken Trail (opeenvolgende richting-versterking) via run-length encoding
+    df["Trail"] = bereken_trail(df["Richting"])
+    df["Advies"] = np.nan
+
+    # ✅ Advieslogica
+    if risk_aversion:
+        if "SAT_Trend" not in df.columns:
+            df = calculate_sat(df)  # anders SAT van de aanroeper houden (ook de float-stage van debug=True)
+        df["Advies"] = bepaal_advies_voorzichtig(
+            df["SAM"].to_numpy(dtype=float),
+            df["Trend"].to_numpy(dtype=float),
+            df["SAT_Trend"].to_numpy(dtype=float),
+        )
+        df["Advies"] = df["Advies"].ffill()
+    else:
+        mask_koop = (df["Richting"] == 1) & (df["Trail"] >= threshold) & (df["Advies"].isna())
+        mask_verkoop = (df["Richting"] == -1) & (df["Trail"] >= threshold) & (df["Advies"].isna())
+
+        df.loc[mask_koop, "Advies"] = "Kopen"
+        df.loc[mask_verkoop, "Advies"] = "Verkopen"
+        df["Advies"] = df["Advies"].ffill()
+
+    # 📊 Bereken rendementen op basis van adviesgroepering
+    _, advies_starts = bereken_runs(df["Advies"].to_numpy())
+    df["AdviesGroep"] = np.repeat(
+        np.arange(1, len(advies_starts) + 1), np.diff(np.append(advies_starts, len(df)))
+    )
+    df["Markt-%"], df["SAM-%"] = bereken_groepsrendementen(
+        df["Close"], df["Advies"].to_numpy(), advies_starts
+    )
+
+    if "Advies" in df.columns and df["Advies"].notna().any():
+        huidig_advies = df["Advies"].dropna().iloc[-1]
+    else:
+        huidig_advies = "Niet beschikbaar"
+
+    return df, huidig_advies
+    
+#--- Advies en rendement EINDE
+
+
+# --- Backtest: trades uit de adviezen ---
+# 💼 Alle trades in één doorgang uit de adviesreeks (alleen rijen met Kopen/Verkopen, zoals df_signalen).
+# Elke wissel van advies sluit de lopende trade op de Close van die rij en opent de volgende;
+# de laatste trade sluit op de laatste koers. Trades zonder koers- of datumverschil tellen niet mee.
+# Een Koop- of Verkoop-backtest bevat precies de trades van dat type uit deze "Beide"-tabel.
+SIGNAALTYPES = {"Koop": "Kopen", "Verkoop": "Verkopen", "Beide": "Beide"}
+TRADE_KOLOMMEN = [
+    "Type", "Open datum", "Open prijs", "Sluit datum", "Sluit prijs", "Rendement (%)", "SAM", "Trend",
+]
+
+
+def extraheer_trades(df_signalen, close_col="Close"):
+    df_signalen = df_signalen[df_signalen["Advies"].isin(["Kopen", "Verkopen"])]
+    if df_signalen.empty:
+        return pd.DataFrame(columns=TRADE_KOLOMMEN)
+
+    advies = df_signalen["Advies"].to_numpy()
+    close = df_signalen[close_col].to_numpy(dtype=float)
+    datums = df_signalen.index
+    n = len(advies)
+
+    starts = np.flatnonzero(np.concatenate(([True], advies[1:] != advies[:-1])))
+    einden = np.append(starts[1:], n - 1)
+
+    open_prijs, sluit_prijs = close[starts], close[einden]
+    kopen = advies[starts] == "Kopen"
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rendement = np.where(
+            kopen,
+            (sluit_prijs - open_prijs) / open_prijs * 100,
+            (open_prijs - sluit_prijs) / open_prijs * 100,
+        )
+
+    geldig = (open_prijs != sluit_prijs) & (datums[starts] != datums[einden])
+    starts, einden = starts[geldig], einden[geldig]
+
+    sam = df_signalen["SAM"].to_numpy()[starts] if "SAM" in df_signalen.columns else np.nan
+    trend = df_signalen["Trend"].to_numpy()[starts] if "Trend" in df_signalen.columns else np.nan
+    return pd.DataFrame({
+        "Type": advies[starts],
+        "Open datum": datums[starts].date,
+        "Open prijs": open_prijs[geldig],
+        "Sluit datum": datums[einden].date,
+        "Sluit prijs": sluit_prijs[geldig],
+        "Rendement (%)": rendement[geldig],
+        "SAM": sam,
+        "Trend": trend,
+    })
+
+
+# 📊 SAM-rendement per signaaltype (Koop / Verkoop / Beide) uit de tradetabel
+def sam_rendement_per_type(trades):
+    rendementen = {}
+    for signaal_type, advies in SIGNAALTYPES.items():
+        selectie = trades if advies == "Beide" else trades[trades["Type"] == advies]
+        rendementen[signaal_type] = sum(selectie["Rendement (%)"].tolist(), 0.0)
+    return rendementen
@@ -0,0 +1,394 @@
+import math
+from collections import deque
+
+import numpy as np
+
+# --- Streaming SAM-engine ---
+# 📡 Houdt per ticker de lopende toestand bij en werkt per nieuwe candle bij in O(1),
+# zodat niet elke 15 minuten de volledige historie opnieuw berekend hoeft te worden.
+# Uitkomsten zijn per bar gelijk aan calculate_sam → calculate_sat → determine_advice in sam_core
+# (gecontroleerd door stream_pariteit.py).
+# Geen Streamlit/ta-imports: bruikbaar vanuit batch-jobs en scanners.
+
+NAN = float("nan")
+
+
+def _is_nan(x):
+    return x != x
+
+
+# 📈 EMA zoals pandas ewm(span, adjust=False): zelfde stappen, dus bit-gelijk aan de batch
+class _Ema:
+    def __init__(self, span, min_periods=0):
+        self.alpha = 2.0 / (span + 1.0)
+        self.min_periods = min_periods
+        self.waarde = NAN
+        self.aantal = 0
+
+    def update(self, x):
+        if not _is_nan(x):
+            self.aantal += 1
+            if _is_nan(self.waarde):
+                self.waarde = x
+            elif self.waarde != x:
+                oud = 1.0 - self.alpha
+                self.waarde = (oud * self.waarde + self.alpha * x) / (oud + self.alpha)
+        return self.waarde if self.aantal >= max(self.min_periods, 1) else NAN
+
+
+# 📊 Rollend gemiddelde zoals pandas rolling(window).mean() (Kahan-som voor toevoegen/verwijderen)
+class _RollendGemiddelde:
+    def __init__(self, window):
+        self.window = window
+        self.venster = deque()
+        self.som = 0.0
+        self.comp_bij = 0.0
+        self.comp_af = 0.0
+        self.aantal = 0
+        self.negatief = 0
+        self.zelfde_reeks = 0
+        self.vorige = NAN
+
+    def update(self, x):
+        self.venster.append(x)
+        if len(self.venster) > self.window:
+            oud = self.venster.popleft()
+            if not _is_nan(oud):
+                self.aantal -= 1
+                y = -oud - self.comp_af
+                t = self.som + y
+                self.comp_af = t - self.som - y
+                self.som = t
+                if math.copysign(1.0, oud) < 0:
+                    self.negatief -= 1
+
+        if not _is_nan(x):
+            self.aantal += 1
+            y = x - self.comp_bij
+            t = self.som + y
+            self.comp_bij = t - self.som - y
+            self.som = t
+            if math.copysign(1.0, x) < 0:
+                self.negatief += 1
+            self.zelfde_reeks = self.zelfde_reeks + 1 if x == self.vorige else 1
+            self.vorige = x
+
+        if self.aantal < self.window:
+            return NAN
+        if self.zelfde_reeks >= self.aantal:
+            return self.vorige
+        gemiddelde = self.som / self.aantal
+        if self.negatief == 0 and gemiddelde < 0:
+            return 0.0
+        if self.negatief == self.aantal and gemiddelde > 0:
+            return 0.0
+        return gemiddelde
+
+
+# ⚖️ WMA over de laatste `window` waarden (gewichten 1..window), NaN zolang het venster niet vol is
+class _Wma:
+    def __init__(self, window):
+        self.window = window
+        self.gewichten = np.arange(1, window + 1, dtype=float)
+        self.totaal = self.gewichten.sum()
+        self.venster = deque(maxlen=window)
+
+    def update(self, x):
+        self.venster.append(x)
+        if len(self.venster) < self.window:
+            return NAN
+        return float(np.dot(np.fromiter(self.venster, dtype=float, count=self.window), self.gewichten) / self.totaal)
+
+
+# 🧭 DI+/DI- volgens ta.trend.ADXIndicator(window, fillna=True): Wilder-smoothing na een startsom
+class _DirectionalIndex:
+    def __init__(self, window=14):
+        self.window = window
+        self.index = -1
+        self.start_tr, self.start_pos, self.start_neg = [], [], []
+        self.trs = self.dip = self.din = NAN
+        self.vorige_high = self.vorige_low = self.vorige_close = NAN
+        self.di_plus = self.di_min = 0.0
+
+    def update(self, high, low, close):
+        self.index += 1
+        if self.index > 0:
+            tr = max(high, self.vorige_close) - min(low, self.vorige_close)
+            omhoog = high - self.vorige_high
+            omlaag = self.vorige_low - low
+            pos = abs(omhoog) if (omhoog > omlaag and omhoog > 0) else 0.0
+            neg = abs(omlaag) if (omlaag > omhoog and omlaag > 0) else 0.0
+
+            if self.index <= self.window:
+                self.start_tr.append(tr)
+                self.start_pos.append(pos)
+                self.start_neg.append(neg)
+                if self.index == self.window:
+                    self.trs = np.array(self.start_tr).sum()
+                    self.dip = np.array(self.start_pos).sum()
+                    self.din = np.array(self.start_neg).sum()
+            else:
+                w = float(self.window)
+                self.trs = self.trs - (self.trs / w) + tr
+                self.dip = self.dip - (self.dip / w) + pos
+                self.din = self.din - (self.din / w) + neg
+                if self.trs != 0:
+                    di_plus = 100 * (self.dip / self.trs)
+                    di_min = 100 * (self.din / self.trs)
+                else:
+                    di_plus = di_min = 0.0
+                # fillna=True: inf/NaN → vorige waarde
+                if math.isfinite(di_plus):
+                    self.di_plus = di_plus
+                if math.isfinite(di_min):
+                    self.di_min = di_min
+
+        self.vorige_high, self.vorige_low, self.vorige_close = high, low, close
+        return self.di_plus, self.di_min
+
+
+class SamStreamer:
+    def __init__(self, threshold=2, risk_aversion=False):
+        self.threshold = threshold
+        self.risk_aversion = risk_aversion
+        self.aantal = 0
+
+        # SAMK: twee bars geheugen
+        self.vorige_open = self.vorige_close = self.vorige2_close = NAN
+        # SAMG / SAMT
+        self.wma = {w: _Wma(w) for w in (6, 18, 35, 80)}
+        self.vorige_wma = {w: NAN for w in (6, 18, 35)}
+        # SAMD
+        self.di = _DirectionalIndex(14)
+        # SAMM: MACD 12/26/9 (zoals ta: min_periods = window)
+        self.ema_snel = _Ema(12, min_periods=12)
+        self.ema_traag = _Ema(26, min_periods=26)
+        self.ema_signaal = _Ema(9, min_periods=9)
+        self.vorige_macd = self.vorige_signaal = NAN
+        # SAMX: TRIX 15
+        self.trix_ema = [_Ema(15), _Ema(15), _Ema(15)]
+        self.vorige_ema3 = self.vorige_trix = NAN
+        # SAT
+        self.ma150 = _RollendGemiddelde(150)
+        self.ma30 = _RollendGemiddelde(30)
+        self.sat_trend = _RollendGemiddelde(25)
+        self.vorige_ma150 = self.vorige_ma30 = NAN
+        self.vorige_stage = 0.0
+        # Trend / Trail / Advies
+        self.trend_wma = _Wma(12)
+        self.vorige_trend = self.vorige_richting = NAN
+        self.trail = 0
+        self.sam_geheugen = deque(maxlen=3)
+        self.advies = NAN
+
+    # 🕯️ SAMK: candlestick-score, eerste passende regel wint
+    def _samk(self, open_, close):
+        c1 = close > open_
+        c2 = self.vorige_close > self.vorige_open
+        c3 = close > self.vorige_close
+        c4 = self.vorige_close > self.vorige2_close
+        c5 = close < open_
+        c6 = self.vorige_close < self.vorige_open
+        c7 = close < self.vorige_close
+        c8 = self.vorige_close < self.vorige2_close
+        if c1 and c2 and c3 and c4:
+            return 1.25
+        if c1 and c3 and c4:
+            return 1.0
+        if c1 and c3:
+            return 0.5
+        if c1 or c3:
+            return 0.25
+        if c5 and c6 and c7 and c8:
+            return -1.25
+        if c5 and c7 and c8:
+            return -1.0
+        if c5 and c7:
+            return -0.5
+        if c5 or c7:
+            return -0.25
+        return 0.0
+
+    # 📈 SAMG: WMA18-band en WMA18/WMA35-crossovers, latere regels overschrijven
+    @staticmethod
+    def _samg(w18, p18, w35, p35):
+        samg = 0.0
+        if w18 > p18 * 1.0015 and w18 > p18:
+            samg = 0.5
+        if w18 < p18 * 1.0015 and w18 > p18:
+            samg = -0.5
+        if w18 > p18 / 1.0015 and w18 <= p18:
+            samg = 0.5
+        if w18 < p18 / 1.0015 and w18 <= p18:
+            samg = -0.5
+        if p18 < p35 and w18 > w35:
+            samg = 0.75
+        if p18 > p35 and w18 < w35:
+            samg = -0.75
+        return samg
+
+    @staticmethod
+    def _samt(w6, p6, w80):
+        samt = 0.0
+        if w6 > p6 and w6 > w80:
+            samt = 0.5
+        if w6 > p6 and w6 <= w80:
+            samt = 0.25
+        if w6 <= p6 and w6 <= w80:
+            samt = -0.75
+        if w6 <= p6 and w6 > w80:
+            samt = -0.5
+        return samt
+
+    @staticmethod
+    def _samd(di_plus, di_min, epsilonneg=10.0, epsilonpos=30.0):
+        samd = 0.0
+        if di_plus > epsilonpos and di_min <= epsilonneg:
+            samd = 0.75
+        if di_min > epsilonpos and di_plus <= epsilonneg:
+            samd = -0.75
+        if di_plus > di_min and di_min > epsilonneg:
+            samd = 0.5
+        if di_min > di_plus and di_plus > epsilonneg:
+            samd = -0.5
+        return samd
+
+    @staticmethod
+    def _samm(macd, signaal, vorige_macd, vorige_signaal):
+        if vorige_macd < vorige_signaal and macd > signaal:
+            return 1.0
+        if macd > signaal:
+            return 0.5
+        if vorige_macd > vorige_signaal and macd < signaal:
+            return -1.0
+        if macd <= signaal:
+            return -0.5
+        return 0.0
+
+    @staticmethod
+    def _samx(trix, vorige_trix):
+        samx = 0.0
+        if trix > 0 and trix > vorige_trix:
+            samx = 0.75
+        if trix > 0 and trix <= vorige_trix:
+            samx = 0.5
+        if trix < 0 and trix < vorige_trix:
+            samx = -0.75
+        if trix < 0 and trix >= vorige_trix:
+            samx = -0.5
+        return samx
+
+    # 🧱 SAT-stage: zelfde zes regels als calculate_sat, NaN telt als 0.0
+    def _sat_stage(self, close, ma150, ma30):
+        def nul(x):
+            return 0.0 if _is_nan(x) else x
+
+        c, m150, m30 = nul(close), nul(ma150), nul(ma30)
+        m150_prev, m30_prev = nul(self.vorige_ma150), nul(self.vorige_ma30)
+
+        if ((m150 > m150_prev and c > m150 and m30 > c) or
+                (c > m150 and m30 < m30_prev and m30 > c)):
+            return -1.0
+        if m150 < m150_prev and c < m150 and c > m30 and m30 > m30_prev:
+            return 1.0
+        if m150 > c and m150 > m150_prev:
+            return -1.0
+        if m150 < c and m150 < m150_prev and m30 > m30_prev:
+            return 1.0
+        if m150 > c and m150 < m150_prev:
+            return -2.0
+        if m150 < c and m150 > m150_prev and m30 > m30_prev:
+            return 2.0
+        return self.vorige_stage
+
+    def append(self, bar):
+        open_ = float(bar["Open"])
+        high = float(bar["High"])
+        low = float(bar["Low"])
+        close = float(bar["Close"])
+        eerste = self.aantal == 0
+
+        # --- SAM-componenten ---
+        samk = self._samk(open_, close)
+
+        wma = {w: self.wma[w].update(close) for w in self.wma}
+        samg = self._samg(wma[18], self.vorige_wma[18], wma[35], self.vorige_wma[35])
+        samt = self._samt(wma[6], self.vorige_wma[6], wma[80])
+
+        di_plus, di_min = self.di.update(high, low, close)
+        samd = self._samd(di_plus, di_min)
+
+        ema_snel = self.ema_snel.update(close)
+        ema_traag = self.ema_traag.update(close)
+        macd = ema_snel - ema_traag
+        signaal = self.ema_signaal.update(macd)
+        samm = self._samm(macd, signaal, self.vorige_macd, self.vorige_signaal)
+
+        ema3 = close
+        for ema in self.trix_ema:
+            ema3 = ema.update(ema3)
+        trix = (ema3 - self.vorige_ema3) / self.vorige_ema3 * 100 if not _is_nan(self.vorige_ema3) else NAN
+        samx = self._samx(trix, self.vorige_trix)
+
+        sam = samk + samg + samt + samd + samm + samx
+
+        # --- SAT ---
+        ma150 = self.ma150.update(close)
+        ma30 = self.ma30.update(close)
+        sat_stage = NAN if eerste else self._sat_stage(close, ma150, ma30)
+        sat_trend = self.sat_trend.update(sat_stage)
+
+        # --- Trend, Richting en Trail ---
+        trend = self.trend_wma.update(sam)
+        richting = float(np.sign(trend - self.vorige_trend))
+        if eerste:
+            self.trail = 0
+        elif richting == self.vorige_richting and richting != 0:
+            self.trail += 1
+        elif richting != 0:
+            self.trail = 1
+        else:
+            self.trail = 0
+
+        # --- Advies (ffill: zonder nieuw signaal blijft het vorige advies staan) ---
+        self.sam_geheugen.append(sam)
+        if self.risk_aversion:
+            if self.aantal >= 2:
+                pos3 = all(s > 0 for s in self.sam_geheugen)
+                neg3 = all(s < 0 for s in self.sam_geheugen)
+                if sat_trend >= 0.0 or pos3:
+                    self.advies = "Verkopen" if (neg3 or trend < 0) else "Kopen"
+                elif sat_trend < 0.0:
+                    self.advies = "Kopen" if (pos3 or trend > 0) else "Verkopen"
+        elif self.trail >= self.threshold:
+            if richting == 1:
+                self.advies = "Kopen"
+            elif richting == -1:
+                self.advies = "Verkopen"
+
+        # --- Toestand doorschuiven ---
+        self.vorige2_close = self.vorige_close
+        self.vorige_open, self.vorige_close = open_, close
+        self.vorige_wma = {w: wma[w] for w in self.vorige_wma}
+        self.vorige_macd, self.vorige_signaal = macd, signaal
+        self.vorige_ema3, self.vorige_trix = ema3, trix
+        self.vorige_ma150, self.vorige_ma30 = ma150, ma30
+        if not eerste:
+            self.vorige_stage = sat_stage
+        self.vorige_trend, self.vorige_richting = trend, richting
+        self.aantal += 1
+
+        return {
+            "SAMK": samk, "SAMG": samg, "SAMT": samt, "SAMD": samd, "SAMM": samm, "SAMX": samx,
+            "SAM": sam, "Trend": trend, "Richting": richting, "Trail": self.trail,
+            "MA30": ma30, "MA150": ma150, "SAT_Stage": sat_stage, "SAT_Trend": sat_trend,
+            "Advies": self.advies,
+        }
+
+    # 🔁 Historie inlezen (bijv. de gecachete DataFrame) en daarna per nieuwe bar append() aanroepen
+    def append_frame(self, df):
+        kolommen = ["Open", "High", "Low", "Close"]
+        return [
+            self.append(dict(zip(kolommen, rij)))
+            for rij in df[kolommen].itertuples(index=False, name=None)
+        ]
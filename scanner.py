@@ -0,0 +1,83 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import pandas as pd
+
+from ohlcv_store import OHLCVStore
+from paneel import Paneel, bereken_paneel, overzicht
+from sam_core import bepaal_periode, calculate_sam, calculate_sat, determine_advice, schoon_ohlcv
+
+# --- Marktscanner ---
+# 🔎 Draait fetch → SAM → SAT → advies voor alle tickers van een universum, verdeeld over processen.
+# De data komt in één gegroepeerde download uit de OHLCV-opslag; de workers rekenen alleen.
+# paneel=True: alle tickers in één gevectoriseerde berekening (paneel.py) i.p.v. per ticker;
+# zelfde uitkomst, alleen zonder tijd per ticker.
+
+SCAN_KOLOMMEN = [
+    "Ticker", "Naam", "Advies", "SAM", "Trend", "Trail", "SAT_Trend",
+    "Laatste wissel", "Bars", "Tijd (s)",
+]
+
+
+# 🧮 Eén ticker volledig doorrekenen (draait in een worker-proces)
+def scan_ticker(ticker, df, threshold, risk_aversion):
+    start = time.perf_counter()
+    rij = {"Ticker": ticker, "Advies": "Niet beschikbaar", "Bars": 0}
+    try:
+        df = schoon_ohlcv(df)
+        if not df.empty:
+            df = calculate_sam(df)
+            df = calculate_sat(df)
+            df, huidig_advies = determine_advice(df, threshold=threshold, risk_aversion=risk_aversion)
+            laatste = df.iloc[-1]
+            rij.update({
+                "Advies": huidig_advies,
+                "SAM": laatste["SAM"],
+                "Trend": laatste["Trend"],
+                "Trail": laatste["Trail"],
+                "SAT_Trend": laatste["SAT_Trend"],
+                "Bars": len(df),
+            })
+            if pd.notna(laatste["Advies"]):
+                rij["Laatste wissel"] = df.index[df["AdviesGroep"] == laatste["AdviesGroep"]][0]
+    except Exception as e:
+        rij["Advies"] = f"Fout: {e}"
+    rij["Tijd (s)"] = time.perf_counter() - start
+    return rij
+
+
+# 🌐 Heel universum scannen; tickers als lijst of als dict {ticker: naam} (zoals in tabs_mapping)
+def scan_universum(tickers, interval, threshold=2, risk_aversion=False, max_workers=None, store=None, paneel=False):
+    namen = tickers if isinstance(tickers, dict) else {}
+    tickers = list(tickers)
+    store = store or OHLCVStore()
+
+    start = time.perf_counter()
+    frames = store.laad_universum(tickers, interval, bepaal_periode(interval))
+    laadtijd = time.perf_counter() - start
+
+    if paneel:
+        max_workers = 1
+        universum = Paneel(frames, tickers)
+        rijen = overzicht(universum, bereken_paneel(universum, threshold, risk_aversion, opwarmen=False))
+    else:
+        max_workers = max_workers or min(len(tickers), os.cpu_count() or 1) or 1
+        argumenten = (tickers, [frames[t] for t in tickers], repeat(threshold), repeat(risk_aversion))
+        if max_workers == 1:
+            rijen = list(map(scan_ticker, *argumenten))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                rijen = list(pool.map(scan_ticker, *argumenten))
+
+    resultaat = pd.DataFrame(rijen, columns=SCAN_KOLOMMEN)
+    resultaat["Naam"] = resultaat["Ticker"].map(namen)
+    resultaat = resultaat.sort_values(["Advies", "Trend"], ascending=[True, False], ignore_index=True)
+
+    info = {
+        "workers": max_workers,
+        "laadtijd": laadtijd,
+        "totaaltijd": time.perf_counter() - start,
+    }
+    return resultaat, info
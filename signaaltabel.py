@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from sam_core import SIGNAALTYPES
+
+# --- Tabel met signalen en rendement ---
+# 📋 Hele kolommen in één keer filteren en opmaken (geen iterrows), HTML in één join.
+# De app bladert door de volledige historie: alleen de rijen van de getoonde pagina worden opgemaakt.
+
+KOLOMMEN = ["Close", "Advies", "SAM", "Trend", "Markt-%", "SAM-%"]
+WEERGAVE = ["Datum", "Close", "Advies", "SAM", "Trend", "Markt-%", "SAM-%"]
+BREEDTES = {"Datum": 110, "Close": 80, "Advies": 90, "SAM": 60, "Trend": 70, "Markt-%": 90, "SAM-%": 90}
+
+STIJL = """
+<style>
+    table {
+        border-collapse: collapse;
+        width: 100%;
+        font-family: Arial, sans-serif;
+        font-size: 14px;
+    }
+    th {
+        background-color: #004080;
+        color: white;
+        padding: 6px;
+        text-align: center;
+    }
+    td {
+        border: 1px solid #ddd;
+        padding: 6px;
+        text-align: right;
+        background-color: #f9f9f9;
+        color: #222222;
+    }
+    tr:nth-child(even) td {
+        background-color: #eef2f7;
+    }
+    tr:hover td {
+        background-color: #d0e4f5;
+    }
+</style>
+"""
+
+
+# ✅ Alle signalen, nieuwste eerst; SAM-% op 0 voor het andere signaaltype (Koop/Verkoop)
+def signalen(df, signaalkeuze="Beide"):
+    tabel = df[KOLOMMEN].dropna()
+    if not isinstance(tabel.index, pd.DatetimeIndex):
+        tabel = tabel.set_axis(pd.to_datetime(tabel.index, errors="coerce"))
+    tabel = tabel[~tabel.index.isna()].sort_index(ascending=False)
+
+    markt = tabel["Markt-%"].to_numpy(dtype=float) * 100
+    sam = tabel["SAM-%"].to_numpy(dtype=float) * 100
+    if signaalkeuze in ("Koop", "Verkoop"):  # Bij 'Beide' gebeurt niets
+        sam = np.where(tabel["Advies"].to_numpy() == SIGNAALTYPES[signaalkeuze], sam, 0.0)
+    return tabel.assign(**{"Markt-%": markt, "SAM-%": sam})
+
+
+# ✅ Opmaak per kolom (alleen voor de rijen die getoond worden)
+def opmaak(tabel, close_decimalen=2):
+    return pd.DataFrame({
+        "Datum": tabel.index.strftime("%d-%m-%Y"),
+        "Close": tabel["Close"].map(f"{{:.{close_decimalen}f}}".format),
+        "Advies": tabel["Advies"].astype(str),
+        "SAM": tabel["SAM"].astype(str),
+        "Trend": tabel["Trend"].map("{:+.3f}".format),
+        "Markt-%": tabel["Markt-%"].map("{:+.2f}%".format),
+        "SAM-%": tabel["SAM-%"].map("{:+.2f}%".format),
+    }, index=tabel.index)
+
+
+# ✅ HTML: cellen per kolom samenvoegen, rijen in één join
+def naar_html(weergave):
+    kop = "".join(f"<th style='width: {BREEDTES[k]}px;'>{k}</th>" for k in WEERGAVE)
+    cellen = "<td>" + weergave[WEERGAVE].astype(str) + "</td>"
+    cellen.iloc[:, 0] = "<tr>" + cellen.iloc[:, 0]
+    cellen.iloc[:, -1] = cellen.iloc[:, -1] + "</tr>"
+    return f"{STIJL}<table><thead><tr>{kop}</tr></thead><tbody>{''.join(cellen.to_numpy().ravel())}</tbody></table>"
+
+
+# 📄 Pagina's van vaste grootte; pagina 1 = nieuwste signalen
+def aantal_paginas(tabel, per_pagina):
+    return max(1, -(-len(tabel) // per_pagina))
+
+
+def pagina(tabel, nummer, per_pagina):
+    start = (nummer - 1) * per_pagina
+    return tabel.iloc[start:start + per_pagina]
@@ -0,0 +1,77 @@
+import argparse
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmark import SOORTEN, synthetische_ohlcv
+from sam_core import calculate_sam, calculate_sat, determine_advice, sam_componenten, schoon_ohlcv
+from sam_stream import SamStreamer
+
+# --- Pariteit streaming ↔ batch ---
+# 🔁 Controleert dat SamStreamer (bar voor bar) per bar dezelfde uitkomst geeft als
+# schoon_ohlcv → calculate_sam → calculate_sat → determine_advice uit sam_core, op synthetische
+# data met vaste seeds (zie benchmark.py). Afwijking → melding per kolom en exitcode 1.
+#
+#   python stream_pariteit.py                               # alle soorten, beide advieslogica's
+#   python stream_pariteit.py --bars 5000 --seeds 1 2 3 --threshold 3
+
+KOLOMMEN = ["SAMK", "SAMG", "SAMT", "SAMD", "SAMM", "SAMX", "SAM", "Trend", "Trail", "SAT_Stage", "SAT_Trend", "Advies"]
+TOLERANTIE = 1e-9  # WMA/rolling incrementeel vs. in één keer: alleen afrondingsverschillen
+
+
+# 🧮 Batch: zelfde keten als de app, componenten als float
+def batch(df, threshold, risk_aversion):
+    df = calculate_sat(calculate_sam(df), debug=True)  # SAT_Stage als float, rij 0 NaN zoals de stream
+    stage = df["SAT_Stage"]
+    df, _ = determine_advice(df, threshold=threshold, risk_aversion=risk_aversion)
+    componenten = sam_componenten(df)
+    return df.assign(SAT_Stage=stage, **{kolom: componenten[kolom] for kolom in componenten})
+
+
+def stream(df, threshold, risk_aversion):
+    streamer = SamStreamer(threshold=threshold, risk_aversion=risk_aversion)
+    return pd.DataFrame(streamer.append_frame(df), index=df.index)
+
+
+# Kolommen die verschillen: {kolom: (aantal bars, eerste bar)}
+def vergelijk(verwacht, uitkomst):
+    verschillen = {}
+    for kolom in KOLOMMEN:
+        a, b = verwacht[kolom].to_numpy(), uitkomst[kolom].to_numpy()
+        if kolom == "Advies":
+            gelijk = (a == b) | (pd.isna(a) & pd.isna(b))
+        else:
+            a, b = a.astype(float), b.astype(float)
+            gelijk = np.isclose(a, b, rtol=TOLERANTIE, atol=TOLERANTIE) | (np.isnan(a) & np.isnan(b))
+        if not gelijk.all():
+            verschillen[kolom] = (int((~gelijk).sum()), verwacht.index[np.argmin(gelijk)])
+    return verschillen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pariteit SamStreamer ↔ sam_core op synthetische data")
+    parser.add_argument("--bars", type=int, default=2_000)
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--soorten", nargs="+", choices=list(SOORTEN), default=list(SOORTEN))
+    parser.add_argument("--threshold", type=int, default=2)
+    args = parser.parse_args(argv)
+    warnings.simplefilter("ignore", FutureWarning)  # fillna(method=...) in schoon_ohlcv
+
+    fouten = 0
+    for soort in args.soorten:
+        for seed in args.seeds:
+            df = schoon_ohlcv(synthetische_ohlcv(args.bars, soort, seed=seed))
+            for risk_aversion in (False, True):
+                verschillen = vergelijk(batch(df, args.threshold, risk_aversion), stream(df, args.threshold, risk_aversion))
+                status = "✅" if not verschillen else "❌"
+                print(f"{status} {soort:<10} seed {seed:<3} risk_aversion={risk_aversion!s:<5} {len(df)} bars")
+                for kolom, (aantal, eerste) in verschillen.items():
+                    print(f"     {kolom}: {aantal} bars verschillen, eerste op {eerste}")
+                fouten += bool(verschillen)
+    return 1 if fouten else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
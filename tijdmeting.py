@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+# --- Tijdmeting per fase ---
+# ⏱️ Benoemde spans rond fetch, SAM (per component), SAT, advies, grafieken en tabel.
+# Uit (standaard): span() geeft één gedeeld leeg object terug, dus vrijwel geen kosten.
+# Aan voor alles via SAM_TIMING=1, of per sessie via ?timing=1 in de app-URL. Elke meting gaat
+# naar de lijst van de huidige run (debugpaneel in de app) en als JSON-regel naar SAM_TIMING_LOG.
+
+LOGBESTAND = os.environ.get("SAM_TIMING_LOG", "sam_timing.jsonl")
+STANDAARD_AAN = os.environ.get("SAM_TIMING") == "1"
+
+_lokaal = threading.local()  # per thread: Streamlit draait elke sessie in een eigen thread
+_log_lock = threading.Lock()
+
+
+# Aan/uit voor de huidige thread (de Streamlit-sessie die nu draait)
+def activeer(aan=True):
+    _lokaal.actief = bool(aan)
+
+
+def actief():
+    return getattr(_lokaal, "actief", STANDAARD_AAN)
+
+
+# 🏷️ Context voor alle metingen van deze run (ticker, interval, ...); begint een nieuwe lijst
+def zet_context(**context):
+    _lokaal.context = context
+    _lokaal.metingen = []
+
+
+def metingen():
+    return list(getattr(_lokaal, "metingen", []))
+
+
+class _GeenMeting:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def zet(self, **velden):
+        pass
+
+
+_GEEN_METING = _GeenMeting()
+
+
+class _Span:
+    __slots__ = ("naam", "velden", "start")
+
+    def __init__(self, naam, velden):
+        self.naam = naam
+        self.velden = velden
+
+    def __enter__(self):
+        stapel = getattr(_lokaal, "stapel", None)
+        if stapel is None:
+            stapel = _lokaal.stapel = []
+        stapel.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    # Extra velden tijdens de meting, bv. zet(rijen=len(df))
+    def zet(self, **velden):
+        self.velden.update(velden)
+
+    def __exit__(self, exc_type, exc, tb):
+        duur = time.perf_counter() - self.start
+        stapel = _lokaal.stapel
+        stapel.pop()
+        meting = {
+            "tijdstip": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "span": "/".join([s.naam for s in stapel] + [self.naam]),
+            **getattr(_lokaal, "context", {}),
+            **self.velden,
+            "duur_ms": round(duur * 1000, 3),
+        }
+        if exc_type is not None:
+            meting["fout"] = exc_type.__name__
+        if not hasattr(_lokaal, "metingen"):
+            _lokaal.metingen = []
+        _lokaal.metingen.append(meting)
+        _schrijf(meting)
+        return False
+
+
+def _schrijf(meting):
+    try:
+        with _log_lock, open(LOGBESTAND, "a", encoding="utf-8") as f:
+            f.write(json.dumps(meting, default=str) + "\n")
+    except OSError:
+        pass  # log is een hulpmiddel; nooit de app laten falen
+
+
+# ⏱️ Gebruik: with span("calculate_sam", rijen=len(df)): ...
+def span(naam, **velden):
+    if not getattr(_lokaal, "actief", STANDAARD_AAN):
+        return _GEEN_METING
+    return _Span(naam, velden)
+
+
+# 💾 Cache-status: meet een gecachte functie met span(..., cache="hit") en roep cache_miss()
+# aan in de functie zelf; die draait alleen als de cache niets had.
+def cache_miss():
+    if actief():
+        stapel = getattr(_lokaal, "stapel", None)
+        if stapel:
+            stapel[-1].velden["cache"] = "miss"
@@ -0,0 +1,83 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import sam_core
+
+# --- Vooruit laden op de achtergrond ---
+# 🔮 Na het kiezen van een ticker volgt bijna altijd een ander interval of de volgende ticker
+# in de dropdown. Die combinaties worden alvast opgehaald (OHLCV-opslag) en doorgerekend
+# (indicatorcache: SAM en SAT), zodat de volgende klik uit de cache komt.
+# - Begrensd: een vaste pool van max_workers threads, gedeeld door alle sessies.
+# - Per sessie: een nieuwe selectie annuleert het werk dat nog in de wachtrij staat; een taak
+#   die al loopt stopt bij de volgende fase (ophalen → SAM → SAT).
+# Uit te zetten met SAM_PREFETCH=0.
+
+STANDAARD_AAN = os.environ.get("SAM_PREFETCH", "1") == "1"
+
+
+class Voorlader:
+    def __init__(self, store, cache, max_workers=2):
+        self.store = store
+        self.cache = cache
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="voorladen")
+        self.lock = threading.Lock()
+        self.sessies = {}  # sessie → (selectie, generatie, futures)
+        self.generatie = 0
+
+    # 📋 Taken bij een selectie: eerst de andere intervallen van de ticker, dan de buren in de tab
+    @staticmethod
+    def taken(ticker, interval, intervallen, tickers, buren=1):
+        taken = [(ticker, i) for i in intervallen if i != interval]
+        tickers = list(tickers)
+        if ticker in tickers:
+            positie = tickers.index(ticker)
+            for afstand in range(1, buren + 1):
+                for buur in (positie + afstand, positie - afstand):
+                    if 0 <= buur < len(tickers):
+                        taken.append((tickers[buur], interval))
+        return taken
+
+    # 🔁 Nieuwe selectie voor een sessie: oud werk annuleren, nieuw werk inplannen.
+    # Dezelfde selectie opnieuw (rerun door een andere widget) laat lopend werk staan.
+    def plan(self, sessie, selectie, taken):
+        with self.lock:
+            # 🧹 Streamlit meldt niet wanneer een sessie eindigt: andere sessies waarvan al het werk
+            # klaar (of geannuleerd) is hier opruimen, zodat self.sessies niet blijft groeien
+            for andere, (_, _, futures) in list(self.sessies.items()):
+                if andere != sessie and all(future.done() for future in futures):
+                    del self.sessies[andere]
+            vorige = self.sessies.get(sessie)
+            if vorige is not None:
+                if vorige[0] == selectie:
+                    return
+                for future in vorige[2]:
+                    future.cancel()
+            self.generatie += 1
+            generatie = self.generatie
+            futures = [self.pool.submit(self._warm, sessie, generatie, t, i) for t, i in taken]
+            self.sessies[sessie] = (selectie, generatie, futures)
+
+    def _geannuleerd(self, sessie, generatie):
+        huidig = self.sessies.get(sessie)
+        return huidig is None or huidig[1] != generatie
+
+    def _warm(self, sessie, generatie, ticker, interval):
+        try:
+            df = sam_core.fetch_data(ticker, interval, self.store)
+            if df.empty or self._geannuleerd(sessie, generatie):
+                return
+            df = self.cache.haal_of_bereken("SAM", ticker, interval, df, sam_core.calculate_sam)
+            if self._geannuleerd(sessie, generatie):
+                return
+            self.cache.haal_of_bereken("SAT", ticker, interval, df, sam_core.calculate_sat)
+        except Exception:
+            pass  # vooruit laden is een gok; fouten komen vanzelf naar boven bij het echte gebruik
+
+    # ⏹️ Sessie weg of voorladen uitgezet: alles van deze sessie annuleren
+    def annuleer(self, sessie):
+        with self.lock:
+            vorige = self.sessies.pop(sessie, None)
+        if vorige is not None:
+            for future in vorige[2]:
+                future.cancel()